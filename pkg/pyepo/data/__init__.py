@@ -4,4 +4,4 @@
 Synthetic data generation
 """
 
-from pyepo.data import dataset, shortestpath, knapsack, tsp, portfolio
+from pyepo.data import cache, dataset, shortestpath, knapsack, tsp, portfolio
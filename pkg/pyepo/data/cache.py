@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+On-disk cache of optimal solutions
+"""
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from pyepo.utlis import getRowKeys, getSignature, getState
+
+# index of row digests for each cache directory
+_indexes = {}
+
+
+class solCache:
+    """
+    This class is a persistent, content-addressed cache of optimal solutions.
+
+    Solutions are stored per model signature (model class, args from getArgs,
+    plain attributes such as covariance, and state of the solver model such as
+    added constraints and parameters) in a directory of .npz shards.
+    Each shard keeps a digest for every cost vector, which is indexed once, so
+    that a lookup can reuse any previously solved row.
+
+    Attributes:
+        root (str): directory of the cache
+        path (str): directory of the model signature
+    """
+
+    def __init__(self, root, model):
+        """
+        Args:
+            root (str): directory of the cache
+            model (optModel): an PyEPO optimization model
+        """
+        self.root = root
+        self.path = os.path.join(root, self._getSignature(model))
+        os.makedirs(self.path, exist_ok=True)
+
+    def __repr__(self):
+        return "solCache " + self.path
+
+    def load(self, costs):
+        """
+        A method to look up optimal solutions of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function
+
+        Returns:
+            tuple: optimal solutions (np.ndarray), objective values (np.ndarray) and hit mask (np.ndarray)
+        """
+        costs = np.ascontiguousarray(costs, dtype=np.float64)
+        sols = np.zeros(costs.shape)
+        objs = np.zeros(len(costs))
+        found = np.zeros(len(costs), dtype=bool)
+        # exact hit of the whole cost matrix
+        file = os.path.join(self.path, self._getDigest(costs) + ".npz")
+        if os.path.isfile(file):
+            with np.load(file) as shard:
+                if shard["sols"].shape == costs.shape:
+                    return shard["sols"], shard["objs"], ~found
+        # row-level hit with index of shards
+        index = self._getIndex()
+        hits = {}
+        for i, key in enumerate(getRowKeys(costs)):
+            if key in index:
+                name, j = index[key]
+                hits.setdefault(name, []).append((i, j))
+        # read shards with hits only
+        for name, pairs in hits.items():
+            ind, rows = map(list, zip(*pairs))
+            with np.load(os.path.join(self.path, name)) as shard:
+                sols[ind] = shard["sols"][rows]
+                objs[ind] = shard["objs"][rows]
+            found[ind] = True
+        return sols, objs, found
+
+    def _getIndex(self):
+        """
+        A method to get index from row digest to shard and row, which reads
+        keys of new shards only
+
+        Returns:
+            dict: shard name and row of each digest
+        """
+        index, names = _indexes.setdefault(self.path, ({}, set()))
+        for name in sorted(os.listdir(self.path)):
+            if not name.endswith(".npz") or name in names:
+                continue
+            with np.load(os.path.join(self.path, name)) as shard:
+                keys = shard["keys"]
+            for j, key in enumerate(keys):
+                index.setdefault(key.tobytes(), (name, j))
+            names.add(name)
+        return index
+
+    def save(self, costs, sols, objs):
+        """
+        A method to store optimal solutions of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function
+            sols (np.ndarray): optimal solutions
+            objs (np.ndarray): objective values
+        """
+        costs = np.ascontiguousarray(costs, dtype=np.float64)
+        if not len(costs):
+            return
+        keys = np.frombuffer(b"".join(getRowKeys(costs)), dtype=np.uint8)
+        # write atomically for concurrent runs
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.path)
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, keys=keys.reshape(len(costs), -1),
+                     sols=np.asarray(sols, dtype=np.float64),
+                     objs=np.asarray(objs, dtype=np.float64).reshape(-1))
+        os.replace(tmp, os.path.join(self.path, self._getDigest(costs) + ".npz"))
+
+    @staticmethod
+    def _getDigest(costs):
+        """
+        A method to get digest of a cost matrix
+
+        Args:
+            costs (np.ndarray): costs of objective function
+
+        Returns:
+            str: hex digest
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str(costs.shape).encode())
+        h.update(costs.tobytes())
+        return h.hexdigest()
+
+    @staticmethod
+    def _getSignature(model):
+        """
+        A method to get digest of model class, args, plain attributes and
+        solver state
+
+        Args:
+            model (optModel): an PyEPO optimization model
+
+        Returns:
+            str: hex digest
+        """
+        return getSignature(type(model), getState(model))
+
@@ -4,14 +4,22 @@
 optDataset class based on PyTorch Dataset
 """
 
-import time
+import hashlib
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
 
 import numpy as np
 import torch
-from torch.utils.data import Dataset
+from torch.utils.data import Dataset, IterableDataset, get_worker_info
 from tqdm import tqdm
 
+from pyepo.data.cache import solCache
 from pyepo.model.opt import optModel
+from pyepo.model.pool import optPool
+from pyepo.utlis import getSignature, getState
 
 
 class optDataset(Dataset):
@@ -26,7 +34,7 @@ class optDataset(Dataset):
         objs (np.ndarray): Optimal objective values
     """
 
-    def __init__(self, model, feats, costs):
+    def __init__(self, model, feats, costs, processes=1, verbose=True, cache_dir=None):
         """
         A method to create a optDataset from optModel
 
@@ -34,48 +42,122 @@ class optDataset(Dataset):
             model (optModel): an instance of optModel
             feats (np.ndarray): data features
             costs (np.ndarray): costs of objective function
+            processes (int): number of processors, 1 for single-core, 0 for all of cores
+            verbose (bool): show progress bar or not
+            cache_dir (None/str): directory of on-disk solution cache, None for no cache
         """
         if not isinstance(model, optModel):
             raise TypeError("arg model is not an optModel")
         self.model = model
+        # number of processes
+        if processes not in range(mp.cpu_count()+1):
+            raise ValueError("Invalid processors number {}, only {} cores.".
+                format(processes, mp.cpu_count()))
+        self.processes = mp.cpu_count() if not processes else processes
+        self.verbose = verbose
+        # on-disk cache
+        self.cache = solCache(cache_dir, model) if cache_dir is not None else None
         # data
         self.feats = feats
         self.costs = costs
         # find optimal solutions
         self.sols, self.objs = self._getSols()
+        # cast to contiguous float32 once for zero-copy tensors
+        self.feats, self.costs, self.sols, self.objs = (
+            np.require(data, dtype=np.float32, requirements="C")
+            for data in (self.feats, self.costs, self.sols, self.objs))
 
     def _getSols(self):
         """
         A method to get optimal solutions for all cost vectors
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        if self.verbose:
+            print("Optimizing for optDataset...")
+        self._openPool()
+        try:
+            sols, objs = self._getChunkSols(np.asarray(self.costs))
+        finally:
+            self._closePool()
+        return sols, objs.reshape(-1, 1)
+
+    def _getChunkSols(self, costs):
+        """
+        A method to get optimal solutions for a chunk of cost vectors, with cache
+
+        Args:
+            costs (np.ndarray): costs of objective function
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        if self.cache is None:
+            return self._solve(costs)
+        # solve missing rows only
+        sols, objs, found = self.cache.load(costs)
+        if not found.all():
+            sols[~found], objs[~found] = self._solve(costs[~found])
+            self.cache.save(costs[~found], sols[~found], objs[~found])
+        return sols, objs
+
+    def _solve(self, costs, batch_size=256):
+        """
+        A method to solve a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function
+            batch_size (int): number of cost vectors solved per batch
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
         """
-        sols = []
-        objs = []
-        print("Optimizing for optDataset...")
-        time.sleep(1)
-        for c in tqdm(self.costs):
+        # single-core
+        if self._pool is None:
+            solveBatch = self.model.solveBatch
+        # multi-core with persistent models
+        else:
+            solveBatch = self._pool.solveBatch
+            batch_size *= self.processes
+        # errors of cost shape and solver raised as they are
+        costs = self.model._checkCosts(costs)
+        # solve by batch
+        sols, objs = [], []
+        batches = range(0, len(costs), batch_size)
+        if self.verbose:
+            batches = tqdm(batches)
+        for i in batches:
+            res = solveBatch(costs[i:i+batch_size])
+            # check returned solutions and objective values only
             try:
-                sol, obj = self._solve(c)
-            except:
+                sol, obj = res
+                sol, obj = np.asarray(sol), np.asarray(obj).reshape(-1)
+                if len(sol) != len(obj):
+                    raise ValueError
+            except (TypeError, ValueError) as e:
                 raise ValueError(
                     "For optModel, the method 'solve' should return solution vector and objective value."
-                )
+                ) from e
             sols.append(sol)
-            objs.append([obj])
-        return np.array(sols), np.array(objs)
+            objs.append(obj)
+        sols = np.concatenate(sols) if sols else np.empty((0, self.model.num_cost))
+        objs = np.concatenate(objs) if objs else np.empty(0)
+        return sols, objs
 
-    def _solve(self, cost):
+    def _openPool(self):
         """
-        A method to solve optimization problem to get an optimal solution with given cost
-
-        Args:
-            cost (np.ndarray): cost of objective function
+        A method to start worker processes for multi-core solving
+        """
+        self._pool = optPool(self.model, self.processes) if self.processes > 1 else None
 
-        Returns:
-            tuple: optimal solution (np.ndarray) and objective value (float)
+    def _closePool(self):
+        """
+        A method to shut down worker processes
         """
-        self.model.setObj(cost)
-        sol, obj = self.model.solve()
-        return sol, obj
+        if self._pool is not None:
+            self._pool.close()
+        self._pool = None
 
     def __len__(self):
         """
@@ -88,17 +170,366 @@ class optDataset(Dataset):
 
     def __getitem__(self, index):
         """
-        A method to retrieve data
+        A method to retrieve data, as tensor views of the float32 storage
 
         Args:
-            index (int): data index
+            index (int/np.ndarray): data index, or an array of indices for a pre-collated batch
 
         Returns:
             tuple: data features (torch.tensor), costs (torch.tensor), optimal solutions (torch.tensor) and objective values (torch.tensor)
         """
+        if isinstance(index, torch.Tensor):
+            index = index.numpy()
         return (
-            torch.FloatTensor(self.feats[index]),
-            torch.FloatTensor(self.costs[index]),
-            torch.FloatTensor(self.sols[index]),
-            torch.FloatTensor(self.objs[index]),
+            torch.from_numpy(self.feats[index]),
+            torch.from_numpy(self.costs[index]),
+            torch.from_numpy(self.sols[index]),
+            torch.from_numpy(self.objs[index]),
         )
+
+    def __getitems__(self, indices):
+        """
+        A method to retrieve a batch of data with one slice per array
+
+        Args:
+            indices (list): data indices
+
+        Returns:
+            list: data of each index
+        """
+        return list(zip(*self[np.asarray(indices, dtype=int)]))
+
+
+class optMmapDataset(optDataset):
+    """
+    This class is Torch Dataset for optimization problems with memory-mapped
+    storage. Features, costs, solutions and objective values are written to
+    .npy files as float32 chunk by chunk, so that datasets larger than memory
+    are never loaded as a whole.
+
+    Attributes:
+        model (optModel): Optimization models
+        path (str): directory of the storage
+        feats (np.memmap): Data features
+        costs (np.memmap): Cost vectors
+        sols (np.memmap): Optimal solutions
+        objs (np.memmap): Optimal objective values
+    """
+
+    def __init__(self, model, feats, costs, path, processes=1, verbose=True,
+                 cache_dir=None, chunk_size=65536):
+        """
+        A method to create a optMmapDataset from optModel
+
+        Args:
+            model (optModel): an instance of optModel
+            feats (None/np.ndarray): data features, None to reopen the storage
+            costs (None/np.ndarray): costs of objective function, None to reopen the storage
+            path (str): directory of the storage
+            processes (int): number of processors, 1 for single-core, 0 for all of cores
+            verbose (bool): show progress bar or not
+            cache_dir (None/str): directory of on-disk solution cache, None for no cache
+            chunk_size (int): number of rows loaded into memory at once
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        os.makedirs(path, exist_ok=True)
+        # reopen existing storage
+        self._fresh = feats is not None or costs is not None
+        if self._fresh:
+            # invalidate solutions before overwriting costs
+            self._removeSignature()
+            feats = self._store("feats", feats)
+            costs = self._store("costs", costs)
+        else:
+            feats = self._open("feats")
+            costs = self._open("costs")
+        super().__init__(model, feats, costs, processes, verbose, cache_dir)
+
+    def _getSols(self):
+        """
+        A method to get optimal solutions for all cost vectors chunk by chunk
+
+        Returns:
+            tuple: optimal solutions (np.memmap) and objective values (np.memmap)
+        """
+        # solved before by the same model for the same costs
+        signature = getSignature(type(self.model), {"state": getState(self.model),
+                                                    "costs": self._getCostDigest()})
+        if not self._fresh and os.path.isfile(self._getFile("sols")) \
+            and os.path.isfile(self._getFile("objs")) \
+            and self._readSignature() == signature:
+            return self._open("sols"), self._open("objs")
+        if self.verbose:
+            print("Optimizing for optMmapDataset...")
+        n = len(self.costs)
+        sols = self._create("sols", (n, self.model.num_cost))
+        objs = self._create("objs", (n, 1))
+        self._openPool()
+        try:
+            for i in range(0, n, self.chunk_size):
+                costs = np.asarray(self.costs[i:i+self.chunk_size], dtype=np.float64)
+                sols[i:i+self.chunk_size], objs[i:i+self.chunk_size, 0] = \
+                    self._getChunkSols(costs)
+        finally:
+            self._closePool()
+        # invalidate signature until both arrays are replaced
+        self._removeSignature()
+        sols, objs = self._commit("sols", sols), self._commit("objs", objs)
+        self._writeSignature(signature)
+        return sols, objs
+
+    def _getCostDigest(self):
+        """
+        A method to get digest of stored costs chunk by chunk
+
+        Returns:
+            str: hex digest
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str(self.costs.shape).encode())
+        for i in range(0, len(self.costs), self.chunk_size):
+            h.update(np.ascontiguousarray(self.costs[i:i+self.chunk_size]).tobytes())
+        return h.hexdigest()
+
+    def _readSignature(self):
+        """
+        A method to read the signature of the model and costs which solved the storage
+
+        Returns:
+            str: hex digest, None if missing
+        """
+        if not os.path.isfile(self._getFile("model", ".sig")):
+            return None
+        with open(self._getFile("model", ".sig")) as f:
+            return f.read().strip()
+
+    def _writeSignature(self, signature):
+        """
+        A method to write the signature of the model and costs which solved the storage
+
+        Args:
+            signature (str): hex digest
+        """
+        with open(self._getFile("model", ".sig") + ".tmp", "w") as f:
+            f.write(signature)
+        os.replace(self._getFile("model", ".sig") + ".tmp", self._getFile("model", ".sig"))
+
+    def _removeSignature(self):
+        """
+        A method to remove the signature, so that stored solutions are not reused
+        """
+        if os.path.isfile(self._getFile("model", ".sig")):
+            os.remove(self._getFile("model", ".sig"))
+
+    def _getFile(self, name, ext=".npy"):
+        """
+        A method to get the file of an array
+
+        Args:
+            name (str): name of the array
+            ext (str): file extension
+
+        Returns:
+            str: file path
+        """
+        return os.path.join(self.path, name + ext)
+
+    def _open(self, name):
+        """
+        A method to open an array in storage as copy-on-write memory map
+
+        Args:
+            name (str): name of the array
+
+        Returns:
+            np.memmap: memory-mapped array
+        """
+        return np.load(self._getFile(name), mmap_mode="c")
+
+    def _create(self, name, shape):
+        """
+        A method to create a temporary float32 array in storage
+
+        Args:
+            name (str): name of the array
+            shape (tuple): shape of the array
+
+        Returns:
+            np.memmap: memory-mapped array
+        """
+        return np.lib.format.open_memmap(self._getFile(name) + ".tmp", mode="w+",
+                                         dtype=np.float32, shape=shape)
+
+    def _commit(self, name, array):
+        """
+        A method to flush a temporary array and replace the array in storage
+
+        Args:
+            name (str): name of the array
+            array (np.memmap): memory-mapped array
+
+        Returns:
+            np.memmap: memory-mapped array
+        """
+        array.flush()
+        del array
+        os.replace(self._getFile(name) + ".tmp", self._getFile(name))
+        return self._open(name)
+
+    def _store(self, name, data):
+        """
+        A method to write an array into storage chunk by chunk
+
+        Args:
+            name (str): name of the array
+            data (np.ndarray): array to store
+
+        Returns:
+            np.memmap: memory-mapped array
+        """
+        array = self._create(name, np.shape(data))
+        for i in range(0, len(data), self.chunk_size):
+            array[i:i+self.chunk_size] = data[i:i+self.chunk_size]
+        return self._commit(name, array)
+
+
+class optStreamDataset(IterableDataset):
+    """
+    This class is Torch IterableDataset for optimization problems solved on
+    demand. Chunks of features and costs are pulled from an iterable and solved
+    in a background thread, by the model itself or a pool of worker processes,
+    so that training can start with the first solved chunk and overlap with
+    solving. At most prefetch solved chunks are kept waiting. With multiple
+    DataLoader workers, each worker solves every num_workers-th chunk.
+
+    Attributes:
+        model (optModel): Optimization models
+        data (iterable / function): chunks of data features and costs, or a function returning them
+        processes (int): number of processors
+        prefetch (int): number of solved chunks buffered ahead
+    """
+
+    def __init__(self, model, data, processes=1, prefetch=2):
+        """
+        A method to create a optStreamDataset from optModel
+
+        Args:
+            model (optModel): an instance of optModel
+            data (iterable / function): chunks of data features (np.ndarray) and costs (np.ndarray), such as a list, or a function returning a new generator for each epoch
+            processes (int): number of processors, 1 for single-core, 0 for all of cores
+            prefetch (int): number of solved chunks buffered ahead
+        """
+        if not isinstance(model, optModel):
+            raise TypeError("arg model is not an optModel")
+        self.model = model
+        self.data = data
+        # number of processes
+        if processes not in range(mp.cpu_count()+1):
+            raise ValueError("Invalid processors number {}, only {} cores.".
+                format(processes, mp.cpu_count()))
+        self.processes = mp.cpu_count() if not processes else processes
+        if prefetch < 1:
+            raise ValueError("Invalid prefetch number {}.".format(prefetch))
+        self.prefetch = prefetch
+        # one-shot iterator is consumed by the first epoch
+        self._consumed = False
+
+    def __iter__(self):
+        """
+        A method to iterate over solved data
+
+        Returns:
+            iterator: data features (torch.tensor), costs (torch.tensor), optimal solutions (torch.tensor) and objective values (torch.tensor)
+        """
+        data = self._getData()
+        chunks = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(data, chunks, stop), daemon=True)
+        producer.start()
+        try:
+            while True:
+                chunk = chunks.get()
+                # end of data
+                if chunk is None:
+                    break
+                # error in background
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                for sample in zip(*(torch.from_numpy(data) for data in chunk)):
+                    yield sample
+        finally:
+            # unblock and stop background solving
+            stop.set()
+            while producer.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def _getData(self):
+        """
+        A method to get chunks of data for an epoch, split by DataLoader workers
+
+        Returns:
+            iterator: chunks of data features and costs
+        """
+        # new iterable for each epoch
+        if callable(self.data):
+            data = self.data()
+        else:
+            data = self.data
+            if iter(data) is data:
+                if self._consumed:
+                    raise RuntimeError("Data iterator has been consumed. "
+                                       "Pass a list or a function returning chunks.")
+                self._consumed = True
+        # every num_workers-th chunk in each worker
+        worker_info = get_worker_info()
+        if worker_info is not None:
+            data = itertools.islice(data, worker_info.id, None, worker_info.num_workers)
+        return data
+
+    def _produce(self, data, chunks, stop):
+        """
+        A method to solve chunks of data in background
+
+        Args:
+            data (iterator): chunks of data features and costs
+            chunks (queue.Queue): queue of solved chunks
+            stop (threading.Event): stop signal from consumer
+        """
+        pool = optPool(self.model, self.processes) if self.processes > 1 else None
+        # own copy of model, which may be solved meanwhile in training
+        solveBatch = self.model.copy().solveBatch if pool is None else pool.solveBatch
+        try:
+            for feats, costs in data:
+                if stop.is_set():
+                    return
+                sols, objs = solveBatch(np.asarray(costs, dtype=np.float64))
+                chunk = tuple(np.require(data, dtype=np.float32, requirements="C")
+                              for data in (feats, costs, sols, np.reshape(objs, (-1, 1))))
+                self._put(chunks, stop, chunk)
+            self._put(chunks, stop, None)
+        except Exception as e:
+            self._put(chunks, stop, e)
+        finally:
+            if pool is not None:
+                pool.close()
+
+    @staticmethod
+    def _put(chunks, stop, item):
+        """
+        A method to put an item into the bounded queue until consumer stops
+
+        Args:
+            chunks (queue.Queue): queue of solved chunks
+            stop (threading.Event): stop signal from consumer
+            item (object): solved chunk, end signal or error
+        """
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
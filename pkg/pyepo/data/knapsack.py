@@ -6,6 +6,8 @@ Synthetic data for knapsack problem
 
 import numpy as np
 
+from pyepo.data.utlis import _checkDeg, _iterChunks, _matvec
+
 
 def genData(num_data, num_features, num_items, dim=1, deg=1, noise_width=0, seed=135):
     """
@@ -23,15 +25,36 @@ def genData(num_data, num_features, num_items, dim=1, deg=1, noise_width=0, seed
     Returns:
        tuple: weights of items (np.ndarray), data features (np.ndarray), costs (np.ndarray)
     """
-    # positive integer parameter
-    if type(deg) is not int:
-        raise ValueError("deg = {} should be int.".format(deg))
-    if deg <= 0:
-        raise ValueError("deg = {} should be positive.".format(deg))
+    return next(genDataChunks(num_data, num_features, num_items, dim, deg, noise_width,
+                              chunk_size=max(num_data, 1), seed=seed))
+
+
+def genDataChunks(num_data, num_features, num_items, dim=1, deg=1, noise_width=0,
+                  chunk_size=10000, seed=135, spawn=False, processes=1):
+    """
+    A generator to yield synthetic data and features for knapsack chunk by
+    chunk, which concatenate to the output of genData with the same seed, or
+    with spawn, are drawn from independent streams and can be generated in
+    parallel
+
+    Args:
+        num_data (int): number of data points
+        num_features (int): dimension of features
+        num_items (int): number of items
+        dim (int): dimension of multi-dimensional knapsack
+        deg (int): data polynomial degree
+        noise_width (float): half witdth of data random noise
+        chunk_size (int): number of data points per chunk
+        seed (int): random state seed
+        spawn (bool): draw each chunk from an independent random stream spawned from seed
+        processes (int): number of processors to generate spawned chunks, 1 for single-core, 0 for all of cores
+
+    Returns:
+       iterator: weights of items (np.ndarray), data features (np.ndarray), costs (np.ndarray)
+    """
+    _checkDeg(deg)
     # set seed
     rnd = np.random.RandomState(seed)
-    # number of data points
-    n = num_data
     # dimension of features
     p = num_features
     # dimension of problem
@@ -42,22 +65,36 @@ def genData(num_data, num_features, num_items, dim=1, deg=1, noise_width=0, seed
     weights = rnd.choice(range(300, 800), size=(d,m)) / 100
     # random matrix parameter B
     B = rnd.binomial(1, 0.5, (m, p))
-    # feature vectors
-    x = rnd.normal(0, 1, (n, p))
-    # value of items
-    c = np.zeros((n, m), dtype=int)
-    for i in range(n):
-        # cost without noise
-        values = (np.dot(B, x[i].reshape(p, 1)).T / np.sqrt(p) + 3) ** deg + 1
-        # rescale
-        values *= 5
-        values /= 3.5 ** deg
-        # noise
-        epislon = rnd.uniform(1 - noise_width, 1 + noise_width, m)
-        values *= epislon
-        # convert into int
-        values = np.ceil(values)
-        c[i, :] = values
-        # float
-        c = c.astype(np.float64)
+    # chunks of feature vectors and costs
+    yield from _iterChunks(_genChunk, (weights, B, deg, noise_width), rnd, num_data, p,
+                           chunk_size, seed, spawn, processes)
+
+
+def _genChunk(x, rnd, weights, B, deg, noise_width):
+    """
+    A function to generate costs for a chunk of feature vectors
+
+    Args:
+        x (np.ndarray): data features
+        rnd (np.random.RandomState): random state for noise
+        weights (np.ndarray): weights of items
+        B (np.ndarray): random matrix parameter
+        deg (int): data polynomial degree
+        noise_width (float): half witdth of data random noise
+
+    Returns:
+       tuple: weights of items (np.ndarray), data features (np.ndarray), costs (np.ndarray)
+    """
+    # dimension of features
+    p = x.shape[1]
+    # cost without noise
+    c = (_matvec(B, x) / np.sqrt(p) + 3) ** deg + 1
+    # rescale
+    c *= 5
+    c /= 3.5 ** deg
+    # noise
+    epislon = rnd.uniform(1 - noise_width, 1 + noise_width, c.shape)
+    c *= epislon
+    # convert into int
+    c = np.ceil(c)
     return weights, x, c
@@ -6,6 +6,8 @@ Synthetic data for portfolio
 
 import numpy as np
 
+from pyepo.data.utlis import _checkDeg, _iterChunks, _matvec
+
 
 def genData(num_data, num_features, num_assets, deg=1, noise_level=1, seed=135):
     """
@@ -22,15 +24,35 @@ def genData(num_data, num_features, num_assets, deg=1, noise_level=1, seed=135):
     Returns:
         tuple: data features (np.ndarray), costs (np.ndarray)
     """
-    # positive integer parameter
-    if type(deg) is not int:
-        raise ValueError("deg = {} should be int.".format(deg))
-    if deg <= 0:
-        raise ValueError("deg = {} should be positive.".format(deg))
+    return next(genDataChunks(num_data, num_features, num_assets, deg, noise_level,
+                              chunk_size=max(num_data, 1), seed=seed))
+
+
+def genDataChunks(num_data, num_features, num_assets, deg=1, noise_level=1,
+                  chunk_size=10000, seed=135, spawn=False, processes=1):
+    """
+    A generator to yield synthetic data and features for portfolio chunk by
+    chunk, which concatenate to the output of genData with the same seed, or
+    with spawn, are drawn from independent streams and can be generated in
+    parallel
+
+    Args:
+        num_data (int): number of data points
+        num_features (int): dimension of features
+        num_assets (int): number of assets
+        deg (int): data polynomial degree
+        noise_level (float): level of data random noise
+        chunk_size (int): number of data points per chunk
+        seed (int): random seed
+        spawn (bool): draw each chunk from an independent random stream spawned from seed
+        processes (int): number of processors to generate spawned chunks, 1 for single-core, 0 for all of cores
+
+    Returns:
+        iterator: covariance matrix (np.ndarray), data features (np.ndarray), costs (np.ndarray)
+    """
+    _checkDeg(deg)
     # set seed
     rnd = np.random.RandomState(seed)
-    # number of data points
-    n = num_data
     # dimension of features
     p = num_features
     # number of assets
@@ -39,18 +61,37 @@ def genData(num_data, num_features, num_assets, deg=1, noise_level=1, seed=135):
     B = rnd.binomial(1, 0.5, (m, p))
     # random matrix parameter L
     L = rnd.uniform(-2.5e-3*noise_level, 2.5e-3*noise_level, (num_assets, num_features))
-    # feature vectors
-    x = rnd.normal(0, 1, (n, p))
-    # value of items
-    r = np.zeros((n, m))
-    for i in range(n):
-        # mean return of assets
-        r[i] = (0.05 * np.dot(B, x[i].reshape(p, 1)).T / np.sqrt(p) + \
-                0.1 ** (1 / deg)) ** deg
-        # random noise
-        f = rnd.randn(num_features)
-        eps = rnd.randn(num_assets)
-        r[i] += L @ f + 0.01 * noise_level * eps
     # covariance matrix of the returns
     cov = L @ L.T + (1e-2 * noise_level) ** 2 * np.eye(num_assets)
+    # chunks of feature vectors and costs
+    yield from _iterChunks(_genChunk, (cov, B, L, deg, noise_level), rnd, num_data, p,
+                           chunk_size, seed, spawn, processes)
+
+
+def _genChunk(x, rnd, cov, B, L, deg, noise_level):
+    """
+    A function to generate returns for a chunk of feature vectors
+
+    Args:
+        x (np.ndarray): data features
+        rnd (np.random.RandomState): random state for noise
+        cov (np.ndarray): covariance matrix of the returns
+        B (np.ndarray): random matrix parameter
+        L (np.ndarray): random matrix parameter of factors
+        deg (int): data polynomial degree
+        noise_level (float): level of data random noise
+
+    Returns:
+        tuple: covariance matrix (np.ndarray), data features (np.ndarray), costs (np.ndarray)
+    """
+    # dimension of features
+    p = x.shape[1]
+    # number of assets
+    m = len(B)
+    # mean return of assets
+    r = (0.05 * _matvec(B, x) / np.sqrt(p) + 0.1 ** (1 / deg)) ** deg
+    # random noise, factors and idiosyncratic noise drawn per data point
+    noise = rnd.randn(len(x), p + m)
+    f, eps = noise[:, :p], noise[:, p:]
+    r += _matvec(L, f) + 0.01 * noise_level * eps
     return cov, x, r
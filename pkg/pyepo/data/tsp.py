@@ -7,6 +7,8 @@ Synthetic data for traveling salesman problem
 import numpy as np
 from scipy.spatial import distance
 
+from pyepo.data.utlis import _checkDeg, _iterChunks, _matvec
+
 
 def genData(num_data, num_features, num_nodes, deg=1, noise_width=0, seed=135):
     """
@@ -23,15 +25,35 @@ def genData(num_data, num_features, num_nodes, deg=1, noise_width=0, seed=135):
     Returns:
         tuple: data features (np.ndarray), costs (np.ndarray)
     """
-    # positive integer parameter
-    if type(deg) is not int:
-        raise ValueError("deg = {} should be int.".format(deg))
-    if deg <= 0:
-        raise ValueError("deg = {} should be positive.".format(deg))
+    return next(genDataChunks(num_data, num_features, num_nodes, deg, noise_width,
+                              chunk_size=max(num_data, 1), seed=seed))
+
+
+def genDataChunks(num_data, num_features, num_nodes, deg=1, noise_width=0,
+                  chunk_size=10000, seed=135, spawn=False, processes=1):
+    """
+    A generator to yield synthetic data and features for travelling salesman
+    chunk by chunk, which concatenate to the output of genData with the same
+    seed, or with spawn, are drawn from independent streams and can be
+    generated in parallel
+
+    Args:
+        num_data (int): number of data points
+        num_features (int): dimension of features
+        num_nodes (int): number of nodes
+        deg (int): data polynomial degree
+        noise_width (float): half witdth of data random noise
+        chunk_size (int): number of data points per chunk
+        seed (int): random seed
+        spawn (bool): draw each chunk from an independent random stream spawned from seed
+        processes (int): number of processors to generate spawned chunks, 1 for single-core, 0 for all of cores
+
+    Returns:
+        iterator: data features (np.ndarray), costs (np.ndarray)
+    """
+    _checkDeg(deg)
     # set seed
     rnd = np.random.RandomState(seed)
-    # number of data points
-    n = num_data
     # dimension of features
     p = num_features
     # number of nodes
@@ -41,26 +63,37 @@ def genData(num_data, num_features, num_nodes, deg=1, noise_width=0, seed=135):
                              rnd.normal(0, 1, (m - m // 2, 2))))
     # distance matrix
     org_dist = distance.cdist(coords, coords, "euclidean")
+    # distance of edges
+    dist = org_dist[np.triu_indices(m, k=1)]
     # random matrix parameter B
     B = rnd.binomial(1, 0.5, (m * (m - 1) // 2, p)) * rnd.uniform(
         -2, 2, (m * (m - 1) // 2, p))
-    # feature vectors
-    x = rnd.normal(0, 1, (n, p))
-    # init cost
-    c = np.zeros((n, m * (m - 1) // 2))
-    for i in range(n):
-        # reshape
-        l = 0
-        for j in range(m):
-            for k in range(j + 1, m):
-                c[i, l] = org_dist[j, k]
-                l += 1
-        # noise
-        noise = rnd.uniform(1 - noise_width, 1 + noise_width,
-                                  m * (m - 1) // 2)
-        # from feature to edge
-        c[i] += (((np.dot(B, x[i].reshape(p, 1)).T / np.sqrt(p) + 3)
-                  ** deg) / 3 ** (deg - 1)).reshape(-1) * noise
+    # chunks of feature vectors and costs
+    yield from _iterChunks(_genChunk, (dist, B, deg, noise_width), rnd, num_data, p,
+                           chunk_size, seed, spawn, processes)
+
+
+def _genChunk(x, rnd, dist, B, deg, noise_width):
+    """
+    A function to generate costs for a chunk of feature vectors
+
+    Args:
+        x (np.ndarray): data features
+        rnd (np.random.RandomState): random state for noise
+        dist (np.ndarray): distance of edges
+        B (np.ndarray): random matrix parameter
+        deg (int): data polynomial degree
+        noise_width (float): half witdth of data random noise
+
+    Returns:
+        tuple: data features (np.ndarray), costs (np.ndarray)
+    """
+    # dimension of features
+    p = x.shape[1]
+    # noise
+    noise = rnd.uniform(1 - noise_width, 1 + noise_width, (len(x), len(dist)))
+    # from feature to edge
+    c = dist + (((_matvec(B, x) / np.sqrt(p) + 3) ** deg) / 3 ** (deg - 1)) * noise
     # rounding
     c = np.around(c, decimals=4)
     return x, c
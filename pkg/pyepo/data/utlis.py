@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Utility function
+"""
+
+import multiprocessing as mp
+
+import numpy as np
+from pathos.pools import _ProcessPool
+
+
+def _checkDeg(deg):
+    """
+    A function to check polynomial degree
+
+    Args:
+        deg (int): data polynomial degree
+    """
+    # positive integer parameter
+    if type(deg) is not int:
+        raise ValueError("deg = {} should be int.".format(deg))
+    if deg <= 0:
+        raise ValueError("deg = {} should be positive.".format(deg))
+
+
+def _iterFeats(rnd, num_data, num_features, chunk_size):
+    """
+    A function to draw feature vectors chunk by chunk, with a random state for
+    the noise which continues after all feature vectors, as if all of them were
+    drawn at once
+
+    Args:
+        rnd (np.random.RandomState): random state
+        num_data (int): number of data points
+        num_features (int): dimension of features
+        chunk_size (int): number of data points per chunk
+
+    Returns:
+        iterator: chunk of feature vectors (np.ndarray) and random state for noise
+    """
+    if type(chunk_size) is not int or chunk_size <= 0:
+        raise ValueError("chunk_size = {} should be positive int.".format(chunk_size))
+    # single chunk
+    if chunk_size >= num_data:
+        yield rnd.normal(0, 1, (num_data, num_features)), rnd
+        return
+    # skip feature vectors for the noise stream
+    rnd_noise = np.random.RandomState()
+    rnd_noise.set_state(rnd.get_state())
+    for i in range(0, num_data, chunk_size):
+        rnd_noise.normal(0, 1, (min(chunk_size, num_data - i), num_features))
+    for i in range(0, num_data, chunk_size):
+        yield rnd.normal(0, 1, (min(chunk_size, num_data - i), num_features)), rnd_noise
+
+
+def _matvec(A, x):
+    """
+    A function to multiply a matrix with each row of features, as a stack of
+    matrix-vector products so that results are bit-identical to np.dot per row
+
+    Args:
+        A (np.ndarray): matrix
+        x (np.ndarray): feature vectors
+
+    Returns:
+        np.ndarray: products for each row
+    """
+    return np.matmul(A, x[:, :, None])[:, :, 0]
+
+
+def _iterChunks(genChunk, args, rnd, num_data, num_features, chunk_size, seed,
+                spawn, processes):
+    """
+    A function to generate data chunk by chunk
+
+    Without spawn, chunks continue the random state of genData. With spawn,
+    each chunk draws features and noise from its own stream spawned from the
+    seed, so that chunks can be generated in parallel with a deterministic
+    result.
+
+    Args:
+        genChunk (function): function of feature vectors, random state and args to a chunk of data
+        args (tuple): problem parameters
+        rnd (np.random.RandomState): random state after problem parameters
+        num_data (int): number of data points
+        num_features (int): dimension of features
+        chunk_size (int): number of data points per chunk
+        seed (int): random seed
+        spawn (bool): use independent random streams per chunk
+        processes (int): number of processors, 1 for single-core, 0 for all of cores
+
+    Returns:
+        iterator: chunk of data
+    """
+    if processes not in range(mp.cpu_count()+1):
+        raise ValueError("Invalid processors number {}, only {} cores.".
+            format(processes, mp.cpu_count()))
+    processes = mp.cpu_count() if not processes else processes
+    # continue random state
+    if not spawn:
+        if processes > 1:
+            raise ValueError("Parallel generation requires spawn=True.")
+        for x, rnd_noise in _iterFeats(rnd, num_data, num_features, chunk_size):
+            yield genChunk(x, rnd_noise, *args)
+        return
+    # independent streams
+    if type(chunk_size) is not int or chunk_size <= 0:
+        raise ValueError("chunk_size = {} should be positive int.".format(chunk_size))
+    sizes = [min(chunk_size, num_data - i) for i in range(0, num_data, chunk_size)]
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(genChunk, args, size, num_features, stream)
+             for size, stream in zip(sizes, streams)]
+    if processes == 1:
+        for task in tasks:
+            yield _spawnChunk(task)
+        return
+    with _ProcessPool(processes) as pool:
+        for chunk in pool.imap(_spawnChunk, tasks):
+            yield chunk
+
+
+def _spawnChunk(task):
+    """
+    A function to generate a chunk of data with its own random stream
+
+    Args:
+        task (tuple): chunk function, problem parameters, chunk size, dimension of features and seed sequence
+
+    Returns:
+        tuple: chunk of data
+    """
+    genChunk, args, size, num_features, stream = task
+    rnd = np.random.RandomState(np.random.MT19937(stream))
+    x = rnd.normal(0, 1, (size, num_features))
+    return genChunk(x, rnd, *args)
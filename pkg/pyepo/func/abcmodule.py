@@ -6,13 +6,14 @@ Abstract autograd optimization module
 
 from abc import abstractmethod
 import multiprocessing as mp
-from pathos.multiprocessing import ProcessingPool
 
-import numpy as np
 from torch import nn
 
+from pyepo import EPO
 from pyepo.data.dataset import optDataset
+from pyepo.func.solpool import solutionPool
 from pyepo.model.opt import optModel
+from pyepo.model.pool import optPool
 
 
 class optModule(nn.Module):
@@ -42,20 +43,18 @@ class optModule(nn.Module):
         # single-core
         if self.processes == 1:
             self.pool = None
-        # multi-core
+        # multi-core with persistent models
         else:
-            self.pool = ProcessingPool(self.processes)
+            self.pool = optPool(self.optmodel, self.processes)
         print("Num of cores: {}".format(self.processes))
         # solution pool
         self.solve_ratio = solve_ratio
         if (self.solve_ratio < 0) or (self.solve_ratio > 1):
             raise ValueError("Invalid solving ratio {}. It should be between 0 and 1.".
                 format(self.solve_ratio))
-        self.solpool = None
+        self._solpool = None
         if self.solve_ratio < 1: # init solution pool
-            if not isinstance(dataset, optDataset): # type checking
-                raise TypeError("dataset is not an optDataset")
-            self.solpool = np.unique(dataset.sols.copy(), axis=0) # remove duplicate
+            self._init_solution_pool(dataset)
         # reduction
         self.reduction = reduction
 
@@ -67,11 +66,65 @@ class optModule(nn.Module):
         # convert tensor
         pass
 
+    def close(self):
+        """
+        Shut down the worker pool of multi-core solving
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+    @property
+    def solpool(self):
+        """
+        Dense matrix of solutions in solution pool
+        """
+        if self._solpool is None:
+            return None
+        return self._solpool.sols
+
+    def setSolutionPool(self, capacity=None, policy="lru", nprobe=None, min_size=2048):
+        """
+        Bound the solution pool with a maximum capacity and an eviction policy,
+        and configure the retrieval of the best cached solutions
+
+        Args:
+            capacity (None/int): maximum number of solutions, None for unbounded
+            policy (str): eviction policy, "lru" for least recently selected,
+                "lfu" for least frequently selected, "diverse" for closest to
+                another solution
+            nprobe (None/int): number of clusters to search, None for exact search
+            min_size (int): minimum pool size to use approximate search
+        """
+        if self._solpool is None:
+            raise RuntimeError("No solution pool. Set solve_ratio < 1 with a dataset.")
+        self._solpool.setCapacity(capacity, policy)
+        self._solpool.setRetrieval(nprobe, min_size)
+
+    def _init_solution_pool(self, dataset):
+        """
+        Initialize solution pool with the solutions of training data
+        """
+        if not isinstance(dataset, optDataset): # type checking
+            raise TypeError("dataset is not an optDataset")
+        self._solpool = solutionPool(dataset.sols)
+
     def _update_solution_pool(self, sol):
         """
         Add new solutions to solution pool
         """
-        # add into solpool
-        self.solpool = np.concatenate((self.solpool, sol))
-        # remove duplicate
-        self.solpool = np.unique(self.solpool, axis=0)
+        # add into solpool without duplicate
+        self._solpool.add(sol)
+
+    def _hit_solution_pool(self, objpool):
+        """
+        Record the best solutions in solution pool for the objective values,
+        only used for eviction of a bounded pool
+        """
+        if self._solpool.capacity is None:
+            return
+        if self.optmodel.modelSense == EPO.MINIMIZE:
+            ind = objpool.argmin(dim=1)
+        if self.optmodel.modelSense == EPO.MAXIMIZE:
+            ind = objpool.argmax(dim=1)
+        self._solpool.hit(ind.detach().to("cpu").numpy())
@@ -9,8 +9,7 @@ import torch
 
 from pyepo import EPO
 from pyepo.func.abcmodule import optModule
-from pyepo.data.dataset import optDataset
-from pyepo.func.utlis import _solveWithObj4Par, _solve_in_pass
+from pyepo.func.utlis import _solve_in_pass
 
 
 class NCE(optModule):
@@ -37,9 +36,8 @@ class NCE(optModule):
         """
         super().__init__(optmodel, processes, solve_ratio, reduction, dataset)
         # solution pool
-        if not isinstance(dataset, optDataset): # type checking
-            raise TypeError("dataset is not an optDataset")
-        self.solpool = np.unique(dataset.sols.copy(), axis=0) # remove duplicate
+        if self._solpool is None:
+            self._init_solution_pool(dataset)
 
     def forward(self, pred_cost, true_sol):
         """
@@ -54,11 +52,13 @@ class NCE(optModule):
             sol, _ = _solve_in_pass(cp, self.optmodel, self.processes, self.pool)
             # add into solpool
             self._update_solution_pool(sol)
-        solpool = torch.from_numpy(self.solpool.astype(np.float32)).to(device)
+        solpool = self._solpool.tensor(device)
         # get current obj
         obj_cp = torch.einsum("bd,bd->b", pred_cost, true_sol).unsqueeze(1)
         # get obj for solpool
         objpool_cp = torch.einsum("bd,nd->bn", pred_cost, solpool)
+        # record best solutions
+        self._hit_solution_pool(objpool_cp)
         # get loss
         if self.optmodel.modelSense == EPO.MINIMIZE:
             loss = (obj_cp - objpool_cp).mean(axis=1)
@@ -100,9 +100,8 @@ class contrastiveMAP(optModule):
         """
         super().__init__(optmodel, processes, solve_ratio, reduction, dataset)
         # solution pool
-        if not isinstance(dataset, optDataset): # type checking
-            raise TypeError("dataset is not an optDataset")
-        self.solpool = np.unique(dataset.sols.copy(), axis=0) # remove duplicate
+        if self._solpool is None:
+            self._init_solution_pool(dataset)
 
     def forward(self, pred_cost, true_sol):
         """
@@ -117,11 +116,13 @@ class contrastiveMAP(optModule):
             sol, _ = _solve_in_pass(cp, self.optmodel, self.processes, self.pool)
             # add into solpool
             self._update_solution_pool(sol)
-        solpool = torch.from_numpy(self.solpool.astype(np.float32)).to(device)
+        solpool = self._solpool.tensor(device)
         # get current obj
         obj_cp = torch.einsum("bd,bd->b", pred_cost, true_sol).unsqueeze(1)
         # get obj for solpool
         objpool_cp = torch.einsum("bd,nd->bn", pred_cost, solpool)
+        # record best solutions
+        self._hit_solution_pool(objpool_cp)
         # get loss
         if self.optmodel.modelSense == EPO.MINIMIZE:
             loss, _ = (obj_cp - objpool_cp).max(axis=1)
@@ -10,8 +10,7 @@ from torch.autograd import Function
 
 from pyepo import EPO
 from pyepo.func.abcmodule import optModule
-from pyepo.utlis import getArgs
-from pyepo.func.utlis import sumGammaDistribution
+from pyepo.func.utlis import _getOrder, sumGammaDistribution
 
 
 class perturbedOpt(optModule):
@@ -30,7 +29,7 @@ class perturbedOpt(optModule):
     """
 
     def __init__(self, optmodel, n_samples=10, sigma=1.0, processes=1,
-                 seed=135, solve_ratio=1, dataset=None):
+                 seed=135, solve_ratio=1, dataset=None, skip_solve=False):
         """
         Args:
             optmodel (optModel): an PyEPO optimization model
@@ -40,10 +39,16 @@ class perturbedOpt(optModule):
             seed (int): random state seed
             solve_ratio (float): the ratio of new solutions computed during training
             dataset (None/optDataset): the training data
+            skip_solve (bool): reuse solutions for perturbed costs under which they remain optimal
         """
-        super().__init__(optmodel, processes, solve_ratio, dataset)
+        super().__init__(optmodel, processes, solve_ratio, dataset=dataset)
         # number of samples
         self.n_samples = n_samples
+        # reuse solutions which remain optimal
+        self.skip_solve = skip_solve
+        # number of solver calls and skipped solves
+        self.n_solved = 0
+        self.n_skipped = 0
         # perturbation amplitude
         self.sigma = sigma
         # random state
@@ -132,7 +137,8 @@ class perturbedFenchelYoung(optModule):
     """
 
     def __init__(self, optmodel, n_samples=10, sigma=1.0, processes=1,
-                 seed=135, solve_ratio=1, reduction="mean", dataset=None):
+                 seed=135, solve_ratio=1, reduction="mean", dataset=None,
+                 skip_solve=False):
         """
         Args:
             optmodel (optModel): an PyEPO optimization model
@@ -143,10 +149,16 @@ class perturbedFenchelYoung(optModule):
             solve_ratio (float): the ratio of new solutions computed during training
             reduction (str): the reduction to apply to the output
             dataset (None/optDataset): the training data
+            skip_solve (bool): reuse solutions for perturbed costs under which they remain optimal
         """
         super().__init__(optmodel, processes, solve_ratio, reduction, dataset)
         # number of samples
         self.n_samples = n_samples
+        # reuse solutions which remain optimal
+        self.skip_solve = skip_solve
+        # number of solver calls and skipped solves
+        self.n_solved = 0
+        self.n_skipped = 0
         # perturbation amplitude
         self.sigma = sigma
         # random state
@@ -243,7 +255,7 @@ class implicitMLE(optModule):
 
     def __init__(self, optmodel, n_samples=10, sigma=1.0, lambd=10,
                  distribution=sumGammaDistribution(kappa=5), two_sides=False,
-                 processes=1, solve_ratio=1, dataset=None):
+                 processes=1, solve_ratio=1, dataset=None, skip_solve=False):
         """
         Args:
             optmodel (optModel): an PyEPO optimization model
@@ -255,10 +267,16 @@ class implicitMLE(optModule):
             processes (int): number of processors, 1 for single-core, 0 for all of cores
             solve_ratio (float): the ratio of new solutions computed during training
             dataset (None/optDataset): the training data
+            skip_solve (bool): reuse solutions for perturbed costs under which they remain optimal
         """
-        super().__init__(optmodel, processes, solve_ratio, dataset)
+        super().__init__(optmodel, processes, solve_ratio, dataset=dataset)
         # number of samples
         self.n_samples = n_samples
+        # reuse solutions which remain optimal
+        self.skip_solve = skip_solve
+        # number of solver calls and skipped solves
+        self.n_solved = 0
+        self.n_skipped = 0
         # noise temperature
         self.sigma = sigma
         # smoothing parameter
@@ -369,7 +387,7 @@ class adaptiveImplicitMLE(optModule):
 
     def __init__(self, optmodel, n_samples=10, sigma=1.0,
                  distribution=sumGammaDistribution(kappa=5), two_sides=False,
-                 processes=1, solve_ratio=1, dataset=None):
+                 processes=1, solve_ratio=1, dataset=None, skip_solve=False):
         """
         Args:
             optmodel (optModel): an PyEPO optimization model
@@ -380,10 +398,16 @@ class adaptiveImplicitMLE(optModule):
             processes (int): number of processors, 1 for single-core, 0 for all of cores
             solve_ratio (float): the ratio of new solutions computed during training
             dataset (None/optDataset): the training data
+            skip_solve (bool): reuse solutions for perturbed costs under which they remain optimal
         """
-        super().__init__(optmodel, processes, solve_ratio, dataset)
+        super().__init__(optmodel, processes, solve_ratio, dataset=dataset)
         # number of samples
         self.n_samples = n_samples
+        # reuse solutions which remain optimal
+        self.skip_solve = skip_solve
+        # number of solver calls and skipped solves
+        self.n_solved = 0
+        self.n_skipped = 0
         # noise temperature
         self.sigma = sigma
         # noise distribution
@@ -455,45 +479,100 @@ class adaptiveImplicitMLEFunc(implicitMLEFunc):
 def _solve_or_cache(ptb_c, module):
     # solve optimization
     if np.random.uniform() <= module.solve_ratio:
-        ptb_sols = _solve_in_pass(ptb_c, module.optmodel, module.processes, module.pool)
+        # reuse solutions on single-core
+        skip_solve = module.skip_solve and module.processes == 1
+        ptb_sols, n_skipped = _solve_in_pass(ptb_c, module.optmodel, module.processes,
+                                             module.pool, skip_solve)
+        # record solver calls
+        module.n_solved += ptb_c.shape[0] * ptb_c.shape[1] - n_skipped
+        module.n_skipped += n_skipped
         if module.solve_ratio < 1:
-            sols = ptb_sols.reshape(-1, cp.shape[1])
+            sols = ptb_sols.reshape(-1, ptb_c.shape[2])
             # add into solpool
-            module._update_solution_pool(sol)
+            module._update_solution_pool(sols)
     # best cached solution
     else:
-        ptb_sols = _cache_in_pass(ptb_c, optmodel, module.solpool)
+        ptb_sols = _cache_in_pass(ptb_c, module.optmodel, module._solpool)
     return ptb_sols
 
 
-def _solve_in_pass(ptb_c, optmodel, processes, pool):
+def _solve_in_pass(ptb_c, optmodel, processes, pool, skip_solve=False):
     """
     A function to solve optimization in the forward pass
     """
     # number of instance
     n_samples, ins_num = ptb_c.shape[0], ptb_c.shape[1]
+    # per instance, then per sample
+    costs = ptb_c.transpose(1,0,2).reshape(-1, ptb_c.shape[2])
+    # similar costs adjacent for warm start
+    if processes == 1 and getattr(optmodel, "_warmstart", False):
+        order = _getOrder(ptb_c.transpose(1,0,2))
+    else:
+        order = np.arange(len(costs))
+    ptb_sols = np.empty_like(costs)
+    # reuse solutions which remain optimal
+    if skip_solve and n_samples > 1:
+        solved, n_skipped = _solve_with_cert(costs, order.reshape(ins_num, n_samples),
+                                             optmodel, ptb_sols)
+        order = order[~solved[order]]
+    else:
+        n_skipped = 0
     # single-core
-    if processes == 1:
-        ptb_sols = []
-        for i in range(ins_num):
-            sols = []
-            # per sample
-            for j in range(n_samples):
-                # solve
-                optmodel.setObj(ptb_c[j,i])
-                sol, _ = optmodel.solve()
-                sols.append(sol)
-            ptb_sols.append(sols)
+    if processes == 1 and len(order):
+        ptb_sols[order], _ = optmodel.solveBatch(costs[order])
     # multi-core
-    else:
-        # get class
-        model_type = type(optmodel)
-        # get args
-        args = getArgs(optmodel)
-        # parallel computing
-        ptb_sols = pool.amap(_solveWithObj4Par, ptb_c.transpose(1,0,2),
-                             [args] * ins_num, [model_type] * ins_num).get()
-    return np.array(ptb_sols)
+    elif len(order):
+        ptb_sols[order], _ = pool.solveBatch(costs[order])
+    return ptb_sols.reshape(ins_num, n_samples, -1), n_skipped
+
+
+def _solve_with_cert(costs, ranks, optmodel, ptb_sols):
+    """
+    A function to solve the middle remaining sample of each instance round by
+    round, and reuse its solution for the samples for which its certificate
+    shows optimality, until a round reuses none
+
+    Args:
+        costs (np.ndarray): perturbed costs per instance, then per sample
+        ranks (np.ndarray): samples of each instance along principal direction
+        optmodel (optModel): an PyEPO optimization model
+        ptb_sols (np.ndarray): solutions to fill
+
+    Returns:
+        tuple: mask of solved samples (np.ndarray) and number of skipped solves (int)
+    """
+    solved = np.zeros(len(costs), dtype=bool)
+    n_skipped = 0
+    while True:
+        # middle remaining sample of each instance
+        refs = []
+        for rows in ranks:
+            rows = rows[~solved[rows]]
+            if len(rows):
+                refs.append(rows[len(rows)//2])
+        if not refs:
+            break
+        sols, _, certs = optmodel._solveBatchCert(costs[refs])
+        ptb_sols[refs] = sols
+        solved[refs] = True
+        # no certificate
+        if certs is None:
+            break
+        # remaining samples of the instance for which solution remains optimal
+        skips = 0
+        for ref, sol, cert in zip(refs, sols, certs):
+            rows = ranks[ref // ranks.shape[1]]
+            rows = rows[~solved[rows]]
+            if not len(rows):
+                continue
+            rows = rows[optmodel._checkCert(cert, costs[rows])]
+            ptb_sols[rows] = sol
+            solved[rows] = True
+            skips += len(rows)
+        if not skips:
+            break
+        n_skipped += skips
+    return solved, n_skipped
 
 
 def _cache_in_pass(ptb_c, optmodel, solpool):
@@ -506,35 +585,9 @@ def _cache_in_pass(ptb_c, optmodel, solpool):
     ptb_sols = []
     for j in range(n_samples):
         # best solution in pool
-        solpool_obj = ptb_c[j] @ solpool.T
-        if optmodel.modelSense == EPO.MINIMIZE:
-            ind = np.argmin(solpool_obj, axis=1)
-        if optmodel.modelSense == EPO.MAXIMIZE:
-            ind = np.argmax(solpool_obj, axis=1)
-        ptb_sols.append(solpool[ind])
+        ind, _ = solpool.search(ptb_c[j], optmodel.modelSense)
+        ptb_sols.append(solpool.sols[ind])
+        # record selection, only used for eviction of a bounded pool
+        if solpool.capacity is not None:
+            solpool.hit(ind)
     return np.array(ptb_sols).transpose(1,0,2)
-
-
-def _solveWithObj4Par(perturbed_costs, args, model_type):
-    """
-    A global function to solve function in parallel processors
-
-    Args:
-        perturbed_costs (np.ndarray): costsof objective function with perturbation
-        args (dict): optModel args
-        model_type (ABCMeta): optModel class type
-
-    Returns:
-        list: optimal solution
-    """
-    # rebuild model
-    optmodel = model_type(**args)
-    # per sample
-    sols = []
-    for cost in perturbed_costs:
-        # set obj
-        optmodel.setObj(cost)
-        # solve
-        sol, _ = optmodel.solve()
-        sols.append(sol)
-    return sols
@@ -7,12 +7,10 @@ Learning to rank Losses
 import numpy as np
 import torch
 import torch.nn.functional as F
-from torch import nn
 
 from pyepo import EPO
 from pyepo.func.abcmodule import optModule
-from pyepo.data.dataset import optDataset
-from pyepo.func.utlis import _solveWithObj4Par, _solve_in_pass
+from pyepo.func.utlis import _solve_in_pass
 
 
 class listwiseLTR(optModule):
@@ -40,9 +38,8 @@ class listwiseLTR(optModule):
         """
         super().__init__(optmodel, processes, solve_ratio, reduction, dataset)
         # solution pool
-        if not isinstance(dataset, optDataset): # type checking
-            raise TypeError("dataset is not an optDataset")
-        self.solpool = np.unique(dataset.sols.copy(), axis=0) # remove duplicate
+        if self._solpool is None:
+            self._init_solution_pool(dataset)
 
     def forward(self, pred_cost, true_cost):
         """
@@ -58,10 +55,12 @@ class listwiseLTR(optModule):
             # add into solpool
             self._update_solution_pool(sol)
         # convert tensor
-        solpool = torch.from_numpy(self.solpool.astype(np.float32)).to(device)
+        solpool = self._solpool.tensor(device)
         # obj for solpool
         objpool_c = true_cost @ solpool.T # true cost
         objpool_cp = pred_cost @ solpool.T # pred cost
+        # record best solutions
+        self._hit_solution_pool(objpool_cp)
         # cross entropy loss
         if self.optmodel.modelSense == EPO.MINIMIZE:
             loss = - (F.log_softmax(objpool_cp, dim=1) *
@@ -106,9 +105,8 @@ class pairwiseLTR(optModule):
         """
         super().__init__(optmodel, processes, solve_ratio, reduction, dataset)
         # solution pool
-        if not isinstance(dataset, optDataset): # type checking
-            raise TypeError("dataset is not an optDataset")
-        self.solpool = np.unique(dataset.sols.copy(), axis=0) # remove duplicate
+        if self._solpool is None:
+            self._init_solution_pool(dataset)
 
     def forward(self, pred_cost, true_cost):
         """
@@ -124,30 +122,27 @@ class pairwiseLTR(optModule):
             # add into solpool
             self._update_solution_pool(sol)
         # convert tensor
-        solpool = torch.from_numpy(self.solpool.astype(np.float32)).to(device)
+        solpool = self._solpool.tensor(device)
         # obj for solpool
         objpool_c = torch.einsum("bd,nd->bn", true_cost, solpool) # true cost
         objpool_cp = torch.einsum("bd,nd->bn", pred_cost, solpool) # pred cost
-        # init relu as max(0,x)
-        relu = nn.ReLU()
-        # init loss
-        loss = []
-        for i in range(len(pred_cost)):
-            # best sol
-            if self.optmodel.modelSense == EPO.MINIMIZE:
-                best_ind = torch.argmin(objpool_c[i])
-            if self.optmodel.modelSense == EPO.MAXIMIZE:
-                best_ind = torch.argmax(objpool_c[i])
-            objpool_cp_best = objpool_cp[i, best_ind]
-            # rest sol
-            rest_ind = [j for j in range(len(objpool_cp[i])) if j != best_ind]
-            objpool_cp_rest = objpool_cp[i, rest_ind]
-            # best vs rest loss
-            if self.optmodel.modelSense == EPO.MINIMIZE:
-                loss.append(relu(objpool_cp_best - objpool_cp_rest).mean())
-            if self.optmodel.modelSense == EPO.MAXIMIZE:
-                loss.append(relu(objpool_cp_rest - objpool_cp_best).mean())
-        loss = torch.stack(loss)
+        # record best solutions
+        self._hit_solution_pool(objpool_cp)
+        # best sol
+        if self.optmodel.modelSense == EPO.MINIMIZE:
+            best_ind = torch.argmin(objpool_c, dim=1, keepdim=True)
+        if self.optmodel.modelSense == EPO.MAXIMIZE:
+            best_ind = torch.argmax(objpool_c, dim=1, keepdim=True)
+        objpool_cp_best = torch.gather(objpool_cp, 1, best_ind)
+        # rest sol
+        rest_mask = torch.ones_like(objpool_cp, dtype=torch.bool)
+        rest_mask.scatter_(1, best_ind, False)
+        # best vs rest loss
+        if self.optmodel.modelSense == EPO.MINIMIZE:
+            loss = F.relu(objpool_cp_best - objpool_cp)
+        if self.optmodel.modelSense == EPO.MAXIMIZE:
+            loss = F.relu(objpool_cp - objpool_cp_best)
+        loss = (loss * rest_mask).sum(dim=1) / rest_mask.sum(dim=1)
         # reduction
         if self.reduction == "mean":
             loss = torch.mean(loss)
@@ -186,9 +181,8 @@ class pointwiseLTR(optModule):
         """
         super().__init__(optmodel, processes, solve_ratio, reduction, dataset)
         # solution pool
-        if not isinstance(dataset, optDataset): # type checking
-            raise TypeError("dataset is not an optDataset")
-        self.solpool = np.unique(dataset.sols.copy(), axis=0) # remove duplicate
+        if self._solpool is None:
+            self._init_solution_pool(dataset)
 
     def forward(self, pred_cost, true_cost):
         """
@@ -204,10 +198,12 @@ class pointwiseLTR(optModule):
             # add into solpool
             self._update_solution_pool(sol)
         # convert tensor
-        solpool = torch.from_numpy(self.solpool.astype(np.float32)).to(device)
+        solpool = self._solpool.tensor(device)
         # obj for solpool as score
         objpool_c = true_cost @ solpool.T # true cost
         objpool_cp = pred_cost @ solpool.T # pred cost
+        # record best solutions
+        self._hit_solution_pool(objpool_cp)
         # squared loss
         loss = (objpool_c - objpool_cp).square().mean(axis=1)
         # reduction
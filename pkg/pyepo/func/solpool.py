@@ -0,0 +1,453 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Solution pool for solution caching
+"""
+
+import numpy as np
+import torch
+
+from pyepo import EPO
+
+
+class solutionPool:
+    """
+    This class is a pool of unique feasible solutions. Solutions are hashed
+    (bit-packed if binary) into a dictionary for constant-time membership, and
+    stored in a preallocated array that grows geometrically.
+
+    The pool can be bounded by a maximum capacity. When it is full, solutions
+    are evicted by the policy "lru" (least recently selected), "lfu" (least
+    frequently selected) or "diverse" (closest to another pooled solution).
+
+    For large pools, the best solution for a cost vector can be retrieved
+    approximately from a clustered index: solutions are partitioned by k-means,
+    and only the clusters with the best optimistic bounds are searched.
+
+    A float32 copy of the pool is kept as a persistent tensor on the training
+    device, which only receives new or moved solutions.
+
+    Attributes:
+        sols (np.ndarray): dense matrix of pooled solutions
+        capacity (None/int): maximum number of solutions, None for unbounded
+        policy (str): eviction policy
+        nprobe (None/int): number of clusters to search, None for exact search
+        min_size (int): minimum pool size to use the clustered index
+        stats (dict): number of hits (recorded for bounded pools only), duplicates and evictions
+    """
+
+    def __init__(self, sols, capacity=None, policy="lru", nprobe=None,
+                 min_size=2048, seed=135):
+        """
+        Args:
+            sols (np.ndarray): initial feasible solutions
+            capacity (None/int): maximum number of solutions, None for unbounded
+            policy (str): eviction policy, "lru", "lfu" or "diverse"
+            nprobe (None/int): number of clusters to search, None for exact search
+            min_size (int): minimum pool size to use the clustered index
+            seed (int): random state seed for eviction and clustering
+        """
+        sols = np.asarray(sols, dtype=np.float64)
+        # eviction
+        if (capacity is not None) and (capacity <= 0):
+            raise ValueError("Invalid capacity {}. It should be positive.".
+                format(capacity))
+        if policy not in ("lru", "lfu", "diverse"):
+            raise ValueError("No eviction policy '{}'.".format(policy))
+        self.capacity = capacity
+        self.policy = policy
+        # retrieval
+        self.setRetrieval(nprobe, min_size)
+        self.rnd = np.random.RandomState(seed)
+        # hashed solutions to row index
+        self._index = {}
+        # preallocated storage
+        num = max(len(sols), 1)
+        self._sols = np.empty((num, sols.shape[1]))
+        self._keys = np.empty(num, dtype=object)
+        self._last = np.zeros(num) # last step of selection
+        self._freq = np.zeros(num) # frequency of selection
+        self._assign = np.zeros(num, dtype=int) # cluster, -1 for unindexed
+        self._size = 0
+        self._step = 0
+        # tensor on device and rows modified since last synchronization
+        self._tensor = None
+        self._dirty = []
+        self._synced = 0
+        # statistics
+        self.stats = {"hits": 0, "duplicates": 0, "evictions": 0}
+        # add initial solutions
+        self.add(sols)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return "solutionPool {} x {}".format(self._size, self._sols.shape[1])
+
+    @property
+    def sols(self):
+        """
+        dense matrix of pooled solutions
+        """
+        return self._sols[:self._size]
+
+    def add(self, sols):
+        """
+        A method to add new solutions without duplicates
+
+        Args:
+            sols (np.ndarray): new solutions
+
+        Returns:
+            np.ndarray: index of new solutions which are not in the pool before
+        """
+        sols = np.asarray(sols, dtype=np.float64).reshape(-1, self._sols.shape[1])
+        self._step += 1
+        # filter duplicates
+        new, keys, dups = [], [], []
+        seen = set()
+        for i, key in enumerate(self._getKeys(sols)):
+            if key in self._index:
+                dups.append(self._index[key])
+            elif key not in seen:
+                seen.add(key)
+                new.append(i)
+                keys.append(key)
+        # solutions found again are recently used
+        if dups:
+            self._touch(np.array(dups, dtype=int))
+            self.stats["duplicates"] += len(dups)
+        new = np.array(new, dtype=int)
+        # keep the latest solutions within capacity
+        if (self.capacity is not None) and (len(new) > self.capacity):
+            new, keys = new[-self.capacity:], keys[-self.capacity:]
+        if len(new):
+            # free space
+            if self.capacity is not None:
+                self._evict(self._size + len(new) - self.capacity)
+            self._append(sols[new], keys)
+        return new
+
+    def hit(self, ind):
+        """
+        A method to record pooled solutions selected as the best ones
+
+        Args:
+            ind (np.ndarray): index of selected solutions
+        """
+        ind = np.asarray(ind, dtype=int).reshape(-1)
+        self._step += 1
+        self._touch(ind)
+        self.stats["hits"] += len(ind)
+
+    def setCapacity(self, capacity, policy=None):
+        """
+        A method to change the maximum capacity and evict surplus solutions
+
+        Args:
+            capacity (None/int): maximum number of solutions, None for unbounded
+            policy (None/str): eviction policy, None to keep the current one
+        """
+        if (capacity is not None) and (capacity <= 0):
+            raise ValueError("Invalid capacity {}. It should be positive.".
+                format(capacity))
+        if policy is not None:
+            if policy not in ("lru", "lfu", "diverse"):
+                raise ValueError("No eviction policy '{}'.".format(policy))
+            self.policy = policy
+        self.capacity = capacity
+        if self.capacity is not None:
+            self._evict(self._size - self.capacity)
+
+    def tensor(self, device):
+        """
+        A method to get pooled solutions as a float32 tensor on device
+
+        Args:
+            device (torch.device): device of tensor
+
+        Returns:
+            torch.tensor: pooled solutions
+        """
+        device = torch.device(device)
+        # full copy of pooled rows with preallocated capacity
+        if (self._tensor is None) or (self._tensor.device != device):
+            self._tensor = torch.empty((len(self._sols), self._sols.shape[1]),
+                                       dtype=torch.float32, device=device)
+            self._tensor.data[:self._size] = torch.from_numpy(
+                self.sols.astype(np.float32)).to(device)
+            self._dirty = []
+            self._synced = self._size
+            return self._tensor[:self._size]
+        # modified rows
+        rows = np.unique(np.concatenate(self._dirty)) if self._dirty else np.array([], dtype=int)
+        rows = rows[rows < self._size]
+        self._dirty = []
+        # grow in place with doubled capacity on device
+        if len(self._tensor) < len(self._sols):
+            tensor = torch.empty((len(self._sols), self._sols.shape[1]),
+                                 dtype=torch.float32, device=device)
+            num = min(len(self._tensor), self._size)
+            tensor[:num] = self._tensor[:num]
+            self._tensor = tensor
+        # moved rows overwrite solutions which may be saved for backward
+        elif len(rows) and (rows.min() < self._synced):
+            self._tensor = self._tensor.clone()
+        if len(rows):
+            # write without bumping version of previous views
+            self._tensor.data[rows] = torch.from_numpy(
+                self._sols[rows].astype(np.float32)).to(device)
+        self._synced = self._size
+        return self._tensor[:self._size]
+
+    def setRetrieval(self, nprobe=None, min_size=2048):
+        """
+        A method to configure the retrieval of the best solutions
+
+        Args:
+            nprobe (None/int): number of clusters to search, None for exact search
+            min_size (int): minimum pool size to use the clustered index
+        """
+        if (nprobe is not None) and (nprobe <= 0):
+            raise ValueError("Invalid nprobe {}. It should be positive.".
+                format(nprobe))
+        self.nprobe = nprobe
+        self.min_size = min_size
+        # clustered index and indexed solutions evicted since it was built
+        self._centroids = None
+        self._radius = None
+        self._stale = 0
+
+    def search(self, costs, sense=EPO.MINIMIZE):
+        """
+        A method to find the best pooled solutions for cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+            sense (int): EPO.MINIMIZE or EPO.MAXIMIZE
+
+        Returns:
+            tuple: index of best solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        costs = np.asarray(costs, dtype=np.float64)
+        # exact search
+        if (self.nprobe is None) or (self._size < self.min_size):
+            objs = sense * (costs @ self.sols.T)
+            ind = np.argmin(objs, axis=1)
+            obj = np.take_along_axis(objs, ind.reshape(-1,1), axis=1).reshape(-1)
+            return ind, sense * obj
+        # rebuild index if too many unindexed or evicted solutions
+        fresh = np.where(self._assign[:self._size] < 0)[0]
+        if (self._centroids is None) or (len(fresh) + self._stale > 0.2 * self._size):
+            self._buildIndex()
+            fresh = fresh[:0]
+        ind = np.zeros(len(costs), dtype=int)
+        obj = np.full(len(costs), np.inf)
+        # unindexed solutions
+        self._searchRows(costs, sense, np.arange(len(costs)), fresh, ind, obj)
+        # members of clusters
+        assign = self._assign[:self._size]
+        order = np.argsort(assign, kind="stable")
+        starts = np.searchsorted(assign[order], np.arange(len(self._centroids)+1))
+        # optimistic bound of clusters, clusters emptied by eviction skipped
+        bound = sense * (costs @ self._centroids.T) - \
+                np.linalg.norm(costs, axis=1, keepdims=True) * self._radius
+        bound[:, starts[1:] == starts[:-1]] = np.inf
+        nprobe = min(self.nprobe, len(self._centroids))
+        probe = np.argpartition(bound, nprobe-1, axis=1)[:,:nprobe]
+        for k in np.unique(probe):
+            queries = np.where((probe == k).any(axis=1))[0]
+            rows = order[starts[k]:starts[k+1]]
+            self._searchRows(costs, sense, queries, rows, ind, obj)
+        # exact search for queries without candidates
+        missing = np.where(np.isinf(obj))[0]
+        self._searchRows(costs, sense, missing, np.arange(self._size), ind, obj)
+        return ind, sense * obj
+
+    def _searchRows(self, costs, sense, queries, rows, ind, obj):
+        """
+        A method to update the best solutions of queries with a subset of rows
+
+        Args:
+            costs (np.ndarray): costs of objective function
+            sense (int): EPO.MINIMIZE or EPO.MAXIMIZE
+            queries (np.ndarray): index of cost vectors
+            rows (np.ndarray): index of solutions
+            ind (np.ndarray): index of best solutions, updated in place
+            obj (np.ndarray): signed objective values of best solutions, updated in place
+        """
+        if (len(queries) == 0) or (len(rows) == 0):
+            return
+        objs = sense * (costs[queries] @ self._sols[rows].T)
+        j = np.argmin(objs, axis=1)
+        cand = objs[np.arange(len(queries)), j]
+        better = cand < obj[queries]
+        ind[queries[better]] = rows[j[better]]
+        obj[queries[better]] = cand[better]
+
+    def _buildIndex(self, iters=10, chunk=8192):
+        """
+        A method to partition pooled solutions by k-means
+
+        Args:
+            iters (int): number of Lloyd iterations
+            chunk (int): number of solutions per distance computation
+        """
+        sols = self.sols
+        num_clusters = max(1, int(np.sqrt(self._size)))
+        centroids = sols[self.rnd.choice(self._size, num_clusters, replace=False)]
+        for _ in range(iters):
+            # nearest centroid
+            sqnorm = np.einsum("kd,kd->k", centroids, centroids)
+            assign = np.concatenate([
+                np.argmin(sqnorm - 2 * sols[i:i+chunk] @ centroids.T, axis=1)
+                for i in range(0, self._size, chunk)])
+            # update centroids, empty clusters stay
+            counts = np.bincount(assign, minlength=num_clusters)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sols)
+            nonempty = counts > 0
+            centroids[nonempty] = sums[nonempty] / counts[nonempty,None]
+        # radius of clusters
+        dist = np.linalg.norm(sols - centroids[assign], axis=1)
+        radius = np.zeros(num_clusters)
+        np.maximum.at(radius, assign, dist)
+        self._assign[:self._size] = assign
+        self._centroids = centroids
+        self._radius = radius
+        self._stale = 0
+
+    def _touch(self, ind):
+        """
+        A method to update recency and frequency of solutions
+
+        Args:
+            ind (np.ndarray): index of solutions
+        """
+        self._last[ind] = self._step
+        np.add.at(self._freq, ind, 1)
+
+    def _getKeys(self, sols):
+        """
+        A method to hash solutions, bit-packed for binary solutions
+
+        Args:
+            sols (np.ndarray): solutions
+
+        Returns:
+            list: hashable keys
+        """
+        binary = np.all((sols == 0) | (sols == 1), axis=1)
+        packed = np.packbits(sols.astype(bool), axis=1)
+        return [b"b" + packed[i].tobytes() if binary[i] else b"f" + sols[i].tobytes()
+                for i in range(len(sols))]
+
+    def _append(self, sols, keys):
+        """
+        A method to append solutions into storage
+
+        Args:
+            sols (np.ndarray): solutions
+            keys (list): hashable keys of solutions
+        """
+        size = self._size + len(sols)
+        # double capacity
+        if size > len(self._sols):
+            num = max(size, 2 * len(self._sols))
+            if self.capacity is not None:
+                num = min(num, self.capacity)
+            self._sols = self._grow(self._sols, num)
+            self._keys = self._grow(self._keys, num)
+            self._last = self._grow(self._last, num)
+            self._freq = self._grow(self._freq, num)
+            self._assign = self._grow(self._assign, num)
+        self._sols[self._size:size] = sols
+        self._keys[self._size:size] = keys
+        self._last[self._size:size] = self._step
+        self._freq[self._size:size] = 0
+        self._assign[self._size:size] = -1
+        self._dirty.append(np.arange(self._size, size))
+        for i, key in enumerate(keys):
+            self._index[key] = self._size + i
+        self._size = size
+
+    def _grow(self, arr, num):
+        """
+        A method to reallocate an array with larger capacity
+
+        Args:
+            arr (np.ndarray): array to grow
+            num (int): new capacity
+
+        Returns:
+            np.ndarray: array with new capacity
+        """
+        storage = np.empty((num, *arr.shape[1:]), dtype=arr.dtype)
+        storage[:self._size] = arr[:self._size]
+        return storage
+
+    def _evict(self, num):
+        """
+        A method to evict solutions by the eviction policy
+
+        Args:
+            num (int): number of solutions to evict
+        """
+        if num <= 0:
+            return
+        if self.policy == "lru":
+            victims = np.argsort(self._last[:self._size], kind="stable")[:num]
+        if self.policy == "lfu":
+            victims = np.lexsort((self._last[:self._size],
+                                  self._freq[:self._size]))[:num]
+        if self.policy == "diverse":
+            victims = self._getRedundant(num)
+        self._remove(victims)
+        self.stats["evictions"] += num
+
+    def _getRedundant(self, num):
+        """
+        A method to find solutions closest to other pooled solutions among
+        random candidates
+
+        Args:
+            num (int): number of solutions
+
+        Returns:
+            np.ndarray: index of redundant solutions
+        """
+        num_cands = min(self._size, max(64, 2 * num))
+        cands = self.rnd.choice(self._size, num_cands, replace=False)
+        # squared distance to the nearest neighbor
+        sqnorm = np.einsum("nd,nd->n", self.sols, self.sols)
+        dist = sqnorm[cands,None] + sqnorm[None,:] - 2 * self.sols[cands] @ self.sols.T
+        dist[np.arange(num_cands), cands] = np.inf
+        nn_dist = dist.min(axis=1)
+        return cands[np.argsort(nn_dist, kind="stable")[:num]]
+
+    def _remove(self, victims):
+        """
+        A method to remove solutions by moving surviving tail rows into holes
+
+        Args:
+            victims (np.ndarray): index of solutions to remove
+        """
+        victims = np.unique(victims)
+        size = self._size - len(victims)
+        for key in self._keys[victims]:
+            del self._index[key]
+        self._stale += np.count_nonzero(self._assign[victims] >= 0)
+        # surviving rows beyond new size fill holes within new size
+        holes = victims[victims < size]
+        tail = np.setdiff1d(np.arange(size, self._size), victims)
+        self._sols[holes] = self._sols[tail]
+        self._keys[holes] = self._keys[tail]
+        self._last[holes] = self._last[tail]
+        self._freq[holes] = self._freq[tail]
+        self._assign[holes] = self._assign[tail]
+        self._dirty.append(holes)
+        for i in holes:
+            self._index[self._keys[i]] = i
+        self._keys[size:self._size] = None
+        self._size = size
@@ -6,9 +6,6 @@ Utility function
 
 import numpy as np
 
-from pyepo import EPO
-from pyepo.utlis import getArgs
-
 
 def _solve_or_cache(cp, module):
     """
@@ -22,7 +19,7 @@ def _solve_or_cache(cp, module):
             module._update_solution_pool(sol)
     # best cached solution
     else:
-        sol, obj = _cache_in_pass(cp, module.optmodel, module.solpool)
+        sol, obj = _cache_in_pass(cp, module.optmodel, module._solpool)
     return sol, obj
 
 
@@ -30,33 +27,12 @@ def _solve_in_pass(cp, optmodel, processes, pool):
     """
     A function to solve optimization in the forward/backward pass
     """
-    # number of instance
-    ins_num = len(cp)
     # single-core
     if processes == 1:
-        sol = []
-        obj = []
-        for i in range(ins_num):
-            # solve
-            optmodel.setObj(cp[i])
-            solp, objp = optmodel.solve()
-            sol.append(solp)
-            obj.append(objp)
-        # to numpy
-        sol = np.array(sol)
-        obj = np.array(obj)
+        sol, obj = optmodel.solveBatch(cp)
     # multi-core
     else:
-        # get class
-        model_type = type(optmodel)
-        # get args
-        args = getArgs(optmodel)
-        # parallel computing
-        res = pool.amap(_solveWithObj4Par, cp, [args] * ins_num,
-                        [model_type] * ins_num).get()
-        # get res
-        sol = np.array(list(map(lambda x: x[0], res)))
-        obj = np.array(list(map(lambda x: x[1], res)))
+        sol, obj = pool.solveBatch(cp)
     return sol, obj
 
 
@@ -64,38 +40,36 @@ def _cache_in_pass(cp, optmodel, solpool):
     """
     A function to use solution pool in the forward/backward pass
     """
-    # number of instance
-    ins_num = len(cp)
     # best solution in pool
-    solpool_obj = cp @ solpool.T
-    if optmodel.modelSense == EPO.MINIMIZE:
-        ind = np.argmin(solpool_obj, axis=1)
-    if optmodel.modelSense == EPO.MAXIMIZE:
-        ind = np.argmax(solpool_obj, axis=1)
-    obj = np.take_along_axis(solpool_obj, ind.reshape(-1,1), axis=1).reshape(-1)
-    sol = solpool[ind]
+    ind, obj = solpool.search(cp, optmodel.modelSense)
+    sol = solpool.sols[ind]
+    # record selection, only used for eviction of a bounded pool
+    if solpool.capacity is not None:
+        solpool.hit(ind)
     return sol, obj
 
 
-def _solveWithObj4Par(cost, args, model_type):
+def _getOrder(costs):
     """
-    A function to solve function in parallel processors
+    A function to order the samples of each instance along their principal
+    direction, so that similar costs are solved one after another
 
     Args:
-        cost (np.ndarray): cost of objective function
-        args (dict): optModel args
-        model_type (ABCMeta): optModel class type
+        costs (np.ndarray): costs with shape (instances, samples, num_cost)
 
     Returns:
-        tuple: optimal solution (list) and objective value (float)
+        np.ndarray: order of flattened costs
     """
-    # rebuild model
-    optmodel = model_type(**args)
-    # set obj
-    optmodel.setObj(cost)
-    # solve
-    sol, obj = optmodel.solve()
-    return sol, obj
+    ins_num, n_samples, _ = costs.shape
+    if n_samples <= 1:
+        return np.arange(ins_num * n_samples)
+    # projection onto principal direction
+    centered = costs - costs.mean(axis=1, keepdims=True)
+    _, _, vt = np.linalg.svd(centered, full_matrices=False)
+    proj = np.einsum("isd,id->is", centered, vt[:, 0])
+    # instance by instance
+    order = np.argsort(proj, axis=1, kind="stable")
+    return (order + np.arange(ins_num)[:, None] * n_samples).reshape(-1)
 
 
 def _check_sol(c, w, z):
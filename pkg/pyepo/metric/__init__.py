@@ -8,3 +8,4 @@ from pyepo.metric.mse import MSE
 from pyepo.metric.regret import calRegret, regret
 from pyepo.metric.unambregret import calUnambRegret, unambRegret
 from pyepo.metric.metrics import SPOError, makeSkScorer, makeAutoSkScorer
+from pyepo.metric.evaluator import regretEvaluator
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Streaming regret evaluation
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing as mp
+
+import numpy as np
+import torch
+
+from pyepo.metric.regret import _calRegrets
+from pyepo.metric.unambregret import calUnambRegret
+from pyepo.model.pool import optPool
+
+
+class regretEvaluator:
+    """
+    This class is a streaming evaluator of normalized regret. Batches of
+    predicted costs are solved in a background thread, by a copy of the model
+    or a pool of worker processes, so that prediction of the next batch
+    overlaps with solving. Batches are processed in order of submission.
+
+    Attributes:
+        optmodel (optModel): an PyEPO optimization model
+        processes (int): number of processors
+        unambiguous (bool): evaluate unambiguous regret or not
+        tolerance (float): tolerance of unambiguous regret
+        loss (float): accumulated regret
+        optsum (float): accumulated absolute optimal objective values
+    """
+
+    def __init__(self, optmodel, processes=1, unambiguous=False, tolerance=1e-5):
+        """
+        Args:
+            optmodel (optModel): an PyEPO optimization model
+            processes (int): number of processors, 1 for single-core, 0 for all of cores
+            unambiguous (bool): evaluate unambiguous regret or not
+            tolerance (float): tolerance of unambiguous regret
+        """
+        # number of processes
+        if processes not in range(mp.cpu_count()+1):
+            raise ValueError("Invalid processors number {}, only {} cores.".
+                format(processes, mp.cpu_count()))
+        self.processes = mp.cpu_count() if not processes else processes
+        if unambiguous and self.processes > 1:
+            raise ValueError("Unambiguous regret is evaluated single-core.")
+        # own copy of model, which may be solved meanwhile in training
+        self.optmodel = optmodel.copy()
+        self.unambiguous = unambiguous
+        self.tolerance = tolerance
+        self.pool = optPool(optmodel, self.processes) if self.processes > 1 else None
+        # accumulated results
+        self.loss = 0
+        self.optsum = 0
+        self._futures = []
+        # single background thread keeps batches in order
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def __repr__(self):
+        return "regretEvaluator " + str(self.optmodel)
+
+    def update(self, pred_cost, true_cost, true_obj):
+        """
+        A method to submit a batch for evaluation without waiting
+
+        Args:
+            pred_cost (torch.tensor / np.ndarray): predicted costs
+            true_cost (torch.tensor / np.ndarray): true costs
+            true_obj (torch.tensor / np.ndarray): true optimal objective values
+
+        Returns:
+            Future: regret of the batch
+        """
+        # transfer to host in the caller
+        pred_cost, true_cost, true_obj = (
+            data.detach().to("cpu").numpy() if isinstance(data, torch.Tensor) else np.asarray(data)
+            for data in (pred_cost, true_cost, true_obj))
+        future = self._executor.submit(self._evaluate, pred_cost, true_cost,
+                                       true_obj.reshape(-1))
+        self._futures.append(future)
+        return future
+
+    def result(self):
+        """
+        A method to get normalized regret after all submitted batches
+
+        Returns:
+            Future: normalized regret
+        """
+        return self._executor.submit(self._finish, list(self._futures))
+
+    def close(self):
+        """
+        A method to wait for submitted batches and shut down workers
+        """
+        self._executor.shutdown(wait=True)
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+    def _evaluate(self, pred_cost, true_cost, true_obj):
+        """
+        A method to solve a batch and accumulate regret in background
+
+        Args:
+            pred_cost (np.ndarray): predicted costs
+            true_cost (np.ndarray): true costs
+            true_obj (np.ndarray): true optimal objective values
+
+        Returns:
+            float: regret of the batch
+        """
+        if self.unambiguous:
+            loss = sum(calUnambRegret(self.optmodel, cp, c, z, self.tolerance)
+                       for cp, c, z in zip(pred_cost, true_cost, true_obj))
+        else:
+            if self.pool is None:
+                sols, _ = self.optmodel.solveBatch(pred_cost)
+            else:
+                sols, _ = self.pool.solveBatch(pred_cost)
+            loss = _calRegrets(self.optmodel, sols, true_cost, true_obj).sum()
+        self.loss += loss
+        self.optsum += np.abs(true_obj).sum()
+        return loss
+
+    def _finish(self, futures):
+        """
+        A method to normalize regret after submitted batches
+
+        Args:
+            futures (list): futures of submitted batches
+
+        Returns:
+            float: normalized regret
+        """
+        # raise errors of batches
+        for future in futures:
+            future.result()
+        return self.loss / (self.optsum + 1e-7)
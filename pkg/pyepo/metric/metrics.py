@@ -4,12 +4,22 @@
 Metrics for SKlearn model
 """
 
+from collections import OrderedDict
+import multiprocessing as mp
+
 import numpy as np
 
-from pyepo.utlis import getArgs
-from pyepo import EPO
+from pyepo.model.pool import optPool
+from pyepo.utlis import getArgs, getRowKeys, getSignature
+
+# optimization model, pools and true optima of recent signatures in each process
+_cache = OrderedDict()
+# maximum number of cached signatures
+_CACHE_SIZE = 4
 
-def SPOError(pred_cost, true_cost, model_type, args):
+
+def SPOError(pred_cost, true_cost, model_type, args, processes=1,
+             true_costs=None, true_objs=None):
     """
     A function to calculate normalized true regret
 
@@ -18,46 +28,103 @@ def SPOError(pred_cost, true_cost, model_type, args):
         true_cost (numpy.array): true costs
         model_type (ABCMeta): optModel class type
         args (dict): optModel args
+        processes (int): number of processors, 1 for single-core, 0 for all of cores
+        true_costs (None/numpy.array): true costs with known optimal objective values
+        true_objs (None/numpy.array): optimal objective values of true_costs
 
     Returns:
         float: regret loss
     """
-    pred_cost = np.array(pred_cost)
-    true_cost = np.array(true_cost)
+    pred_cost = np.array(pred_cost, dtype=np.float64)
+    true_cost = np.array(true_cost, dtype=np.float64)
     assert pred_cost.shape == true_cost.shape, \
     "Shape of true and predicted value does not match."
-    # rebuild model
-    optmodel = model_type(**args)
-    # init sum
-    regret_sum = 0
-    optobj_sum = 0
-    for c, cp in zip(true_cost, pred_cost):
-        # opt sol for pred cost
-        optmodel.setObj(cp)
-        sol, _ = optmodel.solve()
-        # obj with true cost
-        obj = np.dot(sol, c)
-        # opt obj for true cost
-        optmodel.setObj(c)
-        _, optobj = optmodel.solve()
-        # calculate regret
-        if optmodel.modelSense == EPO.MINIMIZE:
-            regret = obj - optobj
-        if optmodel.modelSense == EPO.MAXIMIZE:
-            regret = optobj - obj
-        regret_sum += regret
-        optobj_sum += np.abs(optobj)
+    # number of processes
+    if processes not in range(mp.cpu_count()+1):
+        raise ValueError("Invalid processors number {}, only {} cores.".
+            format(processes, mp.cpu_count()))
+    processes = mp.cpu_count() if not processes else processes
+    # rebuild model once per process
+    signature = getSignature(model_type, args)
+    entry = _getEntry(signature, model_type, args)
+    optmodel, optobjs = entry["model"], entry["optobjs"]
+    # known optima
+    if true_costs is not None:
+        optobjs.update(zip(getRowKeys(true_costs), np.reshape(true_objs, -1)))
+    # solve predicted costs, and true costs without known optima
+    keys = getRowKeys(true_cost)
+    missing = [i for i, key in enumerate(keys) if key not in optobjs]
+    sols, objs = _solveBatch(optmodel, np.concatenate((pred_cost, true_cost[missing])),
+                             entry["pools"], processes)
+    for i, optobj in zip(missing, objs[len(pred_cost):]):
+        optobjs[keys[i]] = optobj
+    optobj = np.array([optobjs[key] for key in keys])
+    # obj with true cost
+    obj = np.einsum("ij,ij->i", sols[:len(pred_cost)], true_cost)
+    # calculate regret
+    regret = optmodel.modelSense * (obj - optobj)
     # normalized regret
-    norm_regret = regret_sum / (optobj_sum + 1e-7)
+    norm_regret = regret.sum() / (np.abs(optobj).sum() + 1e-7)
     return norm_regret
 
 
-def makeSkScorer(optmodel):
+def _getEntry(signature, model_type, args):
+    """
+    A function to get the cached model, pools and true optima of a signature,
+    which closes pools of the least recently used signature beyond the limit
+
+    Args:
+        signature (str): digest of model class and args
+        model_type (ABCMeta): optModel class type
+        args (dict): optModel args
+
+    Returns:
+        dict: optimization model, pools and true optima
+    """
+    if signature in _cache:
+        _cache.move_to_end(signature)
+        return _cache[signature]
+    entry = {"model": model_type(**args), "pools": {}, "optobjs": {}}
+    _cache[signature] = entry
+    # evict least recently used
+    while len(_cache) > _CACHE_SIZE:
+        _, old = _cache.popitem(last=False)
+        for pool in old["pools"].values():
+            pool.close()
+    return entry
+
+
+def _solveBatch(optmodel, costs, pools, processes):
+    """
+    A function to solve a batch of costs with optModel or a cached pool of workers
+
+    Args:
+        optmodel (optModel): optimization model
+        costs (numpy.array): costs of objective function
+        pools (dict): cached pools by number of processors
+        processes (int): number of processors
+
+    Returns:
+        tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+    """
+    # single-core
+    if processes == 1:
+        return optmodel.solveBatch(costs)
+    # multi-core with persistent workers
+    if processes not in pools:
+        pools[processes] = optPool(optmodel, processes)
+    return pools[processes].solveBatch(costs)
+
+
+def makeSkScorer(optmodel, processes=1, true_costs=None, true_objs=None):
     """
     A function to create sklearn scorer
 
     Args:
         optmodel (optModel): optimization model
+        processes (int): number of processors, 1 for single-core, 0 for all of cores
+        true_costs (None/numpy.array): true costs with known optimal objective values
+        true_objs (None/numpy.array): optimal objective values of true_costs
 
     Returns:
         scorer: callable object that returns a scalar score; less is better.
@@ -69,16 +136,20 @@ def makeSkScorer(optmodel):
     args = getArgs(optmodel)
     # build score
     SPO_scorer = make_scorer(SPOError, greater_is_better=False,
-                             model_type=model_type, args=args)
+                             model_type=model_type, args=args, processes=processes,
+                             true_costs=true_costs, true_objs=true_objs)
     return SPO_scorer
 
 
-def makeAutoSkScorer(optmodel):
+def makeAutoSkScorer(optmodel, processes=1, true_costs=None, true_objs=None):
     """
     A function to create Auto-SKlearn scorer
 
     Args:
         optmodel (optModel): optimization model
+        processes (int): number of processors, 1 for single-core, 0 for all of cores
+        true_costs (None/numpy.array): true costs with known optimal objective values
+        true_objs (None/numpy.array): optimal objective values of true_costs
 
     Returns:
         scorer: callable object that returns a scalar score; less is better.
@@ -95,7 +166,10 @@ def makeAutoSkScorer(optmodel):
                              needs_proba=False,
                              needs_threshold=False,
                              model_type=model_type,
-                             args=args)
+                             args=args,
+                             processes=processes,
+                             true_costs=true_costs,
+                             true_objs=true_objs)
     return SPO_scorer
 
 
@@ -4,12 +4,15 @@
 True regret loss
 """
 
+import multiprocessing as mp
+
 import numpy as np
 import torch
 
 from pyepo import EPO
+from pyepo.model.pool import optPool
 
-def regret(predmodel, optmodel, dataloader):
+def regret(predmodel, optmodel, dataloader, processes=1):
     """
     A function to evaluate model performance with normalized true regret
 
@@ -17,33 +20,99 @@ def regret(predmodel, optmodel, dataloader):
         predmodel (nn): a regression neural network for cost prediction
         optmodel (optModel): an PyEPO optimization model
         dataloader (DataLoader): Torch dataloader from optDataSet
+        processes (int): number of processors, 1 for single-core, 0 for all of cores
 
     Returns:
         float: true regret loss
     """
+    # predict all at once
+    cp, c, z = _predict(predmodel, dataloader)
+    # solve in batch
+    sols = _solveBatch(optmodel, cp, processes)
+    # accumulate loss
+    loss = _calRegrets(optmodel, sols, c, z).sum()
+    optsum = np.abs(z).sum()
+    # normalized
+    return loss / (optsum + 1e-7)
+
+
+def _predict(predmodel, dataloader):
+    """
+    A function to predict costs for a dataloader, with one transfer per batch
+
+    Args:
+        predmodel (nn): a regression neural network for cost prediction
+        dataloader (DataLoader): Torch dataloader from optDataSet
+
+    Returns:
+        tuple: predicted costs (np.ndarray), true costs (np.ndarray) and true optimal objective values (np.ndarray)
+    """
     # evaluate
     predmodel.eval()
-    loss = 0
-    optsum = 0
+    cps, cs, zs = [], [], []
     # load data
     for data in dataloader:
         x, c, w, z = data
         # cuda
         if next(predmodel.parameters()).is_cuda:
-            x, c, w, z = x.cuda(), c.cuda(), w.cuda(), z.cuda()
+            x = x.cuda()
         # predict
         with torch.no_grad(): # no grad
-            cp = predmodel(x).to("cpu").detach().numpy()
-        # solve
-        for j in range(cp.shape[0]):
-            # accumulate loss
-            loss += calRegret(optmodel, cp[j], c[j].to("cpu").detach().numpy(),
-                              z[j].item())
-        optsum += abs(z).sum().item()
+            cps.append(predmodel(x).to("cpu").detach().numpy())
+        cs.append(c.numpy())
+        zs.append(z.numpy().reshape(-1))
     # turn back train mode
     predmodel.train()
-    # normalized
-    return loss / (optsum + 1e-7)
+    return np.concatenate(cps), np.concatenate(cs), np.concatenate(zs)
+
+
+def _solveBatch(optmodel, costs, processes=1):
+    """
+    A function to solve a batch of costs with optModel or a pool of workers
+
+    Args:
+        optmodel (optModel): an PyEPO optimization model
+        costs (np.ndarray): costs of objective function
+        processes (int): number of processors, 1 for single-core, 0 for all of cores
+
+    Returns:
+        np.ndarray: optimal solutions
+    """
+    # number of processes
+    if processes not in range(mp.cpu_count()+1):
+        raise ValueError("Invalid processors number {}, only {} cores.".
+            format(processes, mp.cpu_count()))
+    processes = mp.cpu_count() if not processes else processes
+    # single-core
+    if processes == 1:
+        sols, _ = optmodel.solveBatch(costs)
+        return sols
+    # multi-core
+    pool = optPool(optmodel, processes)
+    try:
+        sols, _ = pool.solveBatch(costs)
+    finally:
+        pool.close()
+    return sols
+
+
+def _calRegrets(optmodel, sols, true_costs, true_objs):
+    """
+    A function to calculate true regrets of solutions for a batch
+
+    Args:
+        optmodel (optModel): optimization model
+        sols (np.ndarray): solutions of predicted costs
+        true_costs (np.ndarray): true costs
+        true_objs (np.ndarray): true optimal objective values
+
+    Returns:
+        np.ndarray: true regret losses
+    """
+    # obj with true cost
+    objs = np.einsum("ij,ij->i", sols, true_costs)
+    # loss
+    return optmodel.modelSense * (objs - np.reshape(true_objs, -1))
 
 
 def calRegret(optmodel, pred_cost, true_cost, true_obj):
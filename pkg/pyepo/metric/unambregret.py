@@ -4,13 +4,29 @@
 Unambiguous regret loss
 """
 
-import copy
+import weakref
 
 import numpy as np
 import torch
 
 from pyepo import EPO
 
+# errors of solvers without a feasible solution
+_errors = (AttributeError, ValueError, RuntimeError)
+try:
+    from gurobipy import GurobiError
+    _errors += (GurobiError,)
+except ImportError:
+    pass
+try:
+    from coptpy import CoptError
+    _errors += (CoptError,)
+except ImportError:
+    pass
+
+# cached models for the auxiliary constraint
+_auxmodels = weakref.WeakKeyDictionary()
+
 
 def unambRegret(predmodel, optmodel, dataloader, tolerance=1e-5):
     """
@@ -62,8 +78,42 @@ def calUnambRegret(optmodel, pred_cost, true_cost, true_obj, tolerance=1e-5):
     Returns:
         float: unambiguous regret losses
     """
-    # change precision
-    cp = np.around(pred_cost / tolerance).astype(int)
+    # persistent model for the worst case
+    aux_optmodel = _getAuxModel(optmodel)
+    # coarsen precision until worst case is solved
+    while True:
+        # change precision
+        cp = np.around(pred_cost / tolerance).astype(int)
+        try:
+            obj = _calWorstObj(optmodel, aux_optmodel, cp, true_cost)
+            break
+        except _errors:
+            # constraint is always feasible with zero costs
+            if not cp.any():
+                raise
+            tolerance *= 10
+    # loss
+    if optmodel.modelSense == EPO.MINIMIZE:
+        loss = obj - true_obj
+    if optmodel.modelSense == EPO.MAXIMIZE:
+        loss = true_obj - obj
+    return loss
+
+
+def _calWorstObj(optmodel, aux_optmodel, cp, true_cost):
+    """
+    A function to calculate the worst true objective value among optimal
+    solutions for rounded predicted costs
+
+    Args:
+        optmodel (optModel): optimization model
+        aux_optmodel (optModel): model for the auxiliary constraint
+        cp (np.ndarray): rounded predicted costs
+        true_cost (np.ndarray): true costs
+
+    Returns:
+        float: worst objective value
+    """
     # opt sol for pred cost
     optmodel.setObj(cp)
     sol, objp = optmodel.solve()
@@ -71,20 +121,29 @@ def calUnambRegret(optmodel, pred_cost, true_cost, true_obj, tolerance=1e-5):
     objp = np.ceil(np.dot(cp, sol.T))
     # opt for pred cost
     if optmodel.modelSense == EPO.MINIMIZE:
-        wst_optmodel = optmodel.addConstr(cp, objp+1e-2)
+        wst_optmodel = aux_optmodel._setAuxConstr(cp, objp+1e-2)
     if optmodel.modelSense == EPO.MAXIMIZE:
-        wst_optmodel = optmodel.addConstr(-cp, -objp+1e-2)
+        wst_optmodel = aux_optmodel._setAuxConstr(-cp, -objp+1e-2)
     # opt model to find worst case
-    try:
-        wst_optmodel.setObj(-true_cost)
-        _, obj = wst_optmodel.solve()
-    except:
-        tolerance *= 10
-        return calUnambRegret(optmodel, pred_cost, true_cost, true_obj, tolerance=tolerance)
-    obj = -obj
-    # loss
-    if optmodel.modelSense == EPO.MINIMIZE:
-        loss = obj - true_obj
-    if optmodel.modelSense == EPO.MAXIMIZE:
-        loss = true_obj - obj
-    return loss
+    wst_optmodel.setObj(-true_cost)
+    _, obj = wst_optmodel.solve()
+    return -obj
+
+
+def _getAuxModel(optmodel):
+    """
+    A function to get the cached model for the auxiliary constraint
+
+    Args:
+        optmodel (optModel): optimization model
+
+    Returns:
+        optModel: model for the auxiliary constraint
+    """
+    aux_optmodel = _auxmodels.get(optmodel)
+    if aux_optmodel is None:
+        aux_optmodel = optmodel._getAuxModel()
+        # model itself is not cached
+        if aux_optmodel is not optmodel:
+            _auxmodels[optmodel] = aux_optmodel
+    return aux_optmodel
@@ -5,6 +5,7 @@ Optimization Model based on solvers
 """
 
 from pyepo.model import opt
+from pyepo.model import npy
 try:
     from pyepo.model import grb
 except:
@@ -6,7 +6,8 @@ Abstract optimization model based on Cardinal Optimizer（COPT）
 
 from copy import copy
 
-from coptpy import COPT
+import numpy as np
+from coptpy import COPT, LinExpr
 
 from pyepo import EPO
 from pyepo.model.opt import optModel
@@ -61,6 +62,36 @@ class optCoptModel(optModel):
         self._model.solve()
         return [var.x for var in self._model.getVars()], self._model.objVal
 
+    def solveBatch(self, costs):
+        """
+        A method to solve model for a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        # customized objective or solution
+        if (type(self).setObj is not optCoptModel.setObj) or \
+           (type(self).solve is not optCoptModel.solve):
+            return super().solveBatch(costs)
+        costs = self._checkCosts(costs)
+        # list of variables
+        x = [self.x[k] for k in self.x]
+        allvars = self._model.getVars()
+        # clear objective and update coefficients in bulk
+        self._model.setObjective(LinExpr())
+        # preallocate outputs
+        sols = np.empty((len(costs), self.num_cost))
+        objs = np.empty(len(costs))
+        for i, c in enumerate(costs):
+            self._model.setInfo(COPT.Info.Obj, x, c.tolist())
+            self._model.solve()
+            sols[i] = self._model.getInfo(COPT.Info.Value, allvars)
+            objs[i] = self._model.objVal
+        return sols, objs
+
     def copy(self):
         """
         A method to copy model
@@ -76,6 +107,27 @@ class optCoptModel(optModel):
         new_model.x = {key: x[i] for i, key in enumerate(self.x)}
         return new_model
 
+    def _getSolverState(self):
+        """
+        A method to get state of the COPT model, including constraint rows and
+        bounds
+
+        Returns:
+            dict: plain data of the solver model
+        """
+        allvars, constrs = self._model.getVars(), self._model.getConstrs()
+        rows = []
+        for constr in constrs:
+            row = self._model.getRow(constr)
+            rows.append(([row.getVar(i).getIdx() for i in range(row.getSize())],
+                         [row.getCoeff(i) for i in range(row.getSize())]))
+        return {"rows": rows,
+                "clb": self._model.getInfo(COPT.Info.LB, constrs),
+                "cub": self._model.getInfo(COPT.Info.UB, constrs),
+                "lb": self._model.getInfo(COPT.Info.LB, allvars),
+                "ub": self._model.getInfo(COPT.Info.UB, allvars),
+                "vtype": [var.vtype for var in allvars]}
+
     def addConstr(self, coefs, rhs):
         """
         A method to add new constraint
@@ -7,6 +7,8 @@ Abstract optimization model based on GurobiPy
 from copy import copy
 
 import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
 import gurobipy as gp
 from gurobipy import GRB
 
@@ -20,6 +22,12 @@ class optGrbModel(optModel):
 
     Attributes:
         _model (GurobiPy model): Gurobi model
+        _objvars (tuple): cached variables of objective function and their index of cost
+        _warmstart (bool): warm start from the previous solve or not
+        _start (tuple): basis or solution of the previous solve
+        _vars (list): cached variables for warm start
+        _constrs (list): cached constraints for warm start
+        _auxconstr (GurobiPy constraint): auxiliary constraint updated in place
     """
 
     def __init__(self):
@@ -32,6 +40,13 @@ class optGrbModel(optModel):
             self.modelSense = EPO.MAXIMIZE
         # turn off output
         self._model.Params.outputFlag = 0
+        # cached variables of objective function
+        self._objvars = None
+        # warm start from previous solve
+        self._warmstart = False
+        self._resetStart()
+        # auxiliary constraint
+        self._auxconstr = None
 
     def __repr__(self):
         return "optGRBModel " + self.__class__.__name__
@@ -52,13 +67,38 @@ class optGrbModel(optModel):
         """
         if len(c) != self.num_cost:
             raise ValueError("Size of cost vector cannot match vars.")
+        # update coefficients in bulk
+        objvars, objmap = self._getObjVars()
+        self._model.setAttr("Obj", objvars, np.asarray(c, dtype=np.float64)[objmap].tolist())
+
+    def _getObjVars(self):
+        """
+        A method to get variables of objective function, cached after the
+        objective is cleared for the first time
+
+        Returns:
+            tuple: variables (list) and index of cost for each variable (np.ndarray)
+        """
+        if self._objvars is None:
+            self._objvars = self._getObjMap()
+            # clear objective, coefficients set by attribute
+            self._model.setObjective(gp.LinExpr())
+        return self._objvars
+
+    def _getObjMap(self):
+        """
+        A method to map variables of objective function to cost vector
+
+        Returns:
+            tuple: variables (list) and index of cost for each variable (np.ndarray)
+        """
         # mvar
         if isinstance(self.x, gp.MVar):
-            obj = np.array(c) @ self.x
+            objvars = self.x.tolist()
         # vars
         else:
-            obj = gp.quicksum(c[i] * self.x[k] for i, k in enumerate(self.x))
-        self._model.setObjective(obj)
+            objvars = [self.x[k] for k in self.x]
+        return objvars, np.arange(len(objvars))
 
     def solve(self):
         """
@@ -68,7 +108,7 @@ class optGrbModel(optModel):
             tuple: optimal solution (list) and objective value (float)
         """
         self._model.update()
-        self._model.optimize()
+        self._optimize()
         # solution
         if isinstance(self.x, gp.MVar):
             sol = self.x.x
@@ -78,6 +118,222 @@ class optGrbModel(optModel):
         obj = self._model.objVal
         return sol, obj
 
+    def solveBatch(self, costs):
+        """
+        A method to solve model for a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        # customized objective or solution
+        if (type(self).setObj is not optGrbModel.setObj) or \
+           (type(self).solve is not optGrbModel.solve):
+            return super().solveBatch(costs)
+        costs = self._checkCosts(costs)
+        # list of variables
+        if isinstance(self.x, gp.MVar):
+            x = self.x.tolist()
+        else:
+            x = [self.x[k] for k in self.x]
+        # preallocate outputs
+        sols = np.empty((len(costs), self.num_cost))
+        objs = np.empty(len(costs))
+        for i, c in enumerate(costs):
+            self.setObj(c)
+            self._optimize()
+            sols[i] = self._model.getAttr("X", x)
+            objs[i] = self._model.objVal
+        return sols, objs
+
+    def _solveBatchCert(self, costs):
+        """
+        A method to solve model for a batch of cost vectors with certificates,
+        which are optimal bases of linear programs
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray), objective values (np.ndarray) and certificates (None / list)
+        """
+        # customized objective or solution
+        if (type(self).setObj is not optGrbModel.setObj) or \
+           (type(self).solve is not optGrbModel.solve):
+            return super()._solveBatchCert(costs)
+        # basis only for linear program
+        self._model.update()
+        if self._model.IsMIP or self._model.IsQP or self._model.IsQCP:
+            return super()._solveBatchCert(costs)
+        costs = self._checkCosts(costs)
+        # list of variables
+        if isinstance(self.x, gp.MVar):
+            x = self.x.tolist()
+        else:
+            x = [self.x[k] for k in self.x]
+        allvars, constrs = self._model.getVars(), self._model.getConstrs()
+        # constraint matrix, senses and objective variables
+        objvars, objmap = self._getObjVars()
+        A = self._model.getA()
+        lp = (sp.hstack([A, sp.eye(A.shape[0])], format="csc"), A.T.tocsr(),
+              np.array(self._model.getAttr("Sense", constrs)),
+              np.array([var.index for var in objvars], dtype=int),
+              objmap)
+        # preallocate outputs
+        sols = np.empty((len(costs), self.num_cost))
+        objs = np.empty(len(costs))
+        certs = []
+        for i, c in enumerate(costs):
+            self.setObj(c)
+            self._optimize()
+            sols[i] = self._model.getAttr("X", x)
+            objs[i] = self._model.objVal
+            # no basis, such as barrier without crossover
+            try:
+                certs.append((lp, np.array(self._model.getAttr("VBasis", allvars)),
+                              np.array(self._model.getAttr("CBasis", constrs))))
+            except (gp.GurobiError, AttributeError):
+                certs.append(None)
+        return sols, objs, certs
+
+    def _checkCert(self, cert, costs):
+        """
+        A method to check whether an optimal basis remains optimal for cost
+        vectors, by the signs of reduced costs and duals
+
+        Args:
+            cert (tuple): optimal basis with constraint matrix
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            np.ndarray: mask of cost vectors for which solution remains optimal
+        """
+        if cert is None:
+            return super()._checkCert(cert, costs)
+        (AI, AT, senses, objind, objmap), vbasis, cbasis = cert
+        costs = self._checkCosts(costs)
+        mask = np.zeros(len(costs), dtype=bool)
+        # costs of all variables for minimization
+        c = np.zeros((len(costs), AT.shape[0]))
+        c[:, objind] = self.modelSense * costs[:, objmap]
+        # basis matrix with structural and slack columns
+        basic, slack = np.flatnonzero(vbasis == 0), np.flatnonzero(cbasis == 0)
+        if len(basic) + len(slack) != AT.shape[1]:
+            return mask
+        B = AI[:, np.concatenate([basic, len(vbasis) + slack])]
+        # duals and reduced costs
+        try:
+            y = spla.splu(B).solve(np.hstack([c[:, basic], np.zeros((len(c), len(slack)))]).T,
+                                   trans="T").T
+        except RuntimeError:
+            return mask
+        rc = c - AT.dot(y.T).T
+        tol = self._model.Params.OptimalityTol
+        # nonbasic variables at lower bound, upper bound, or superbasic
+        mask = ((rc >= - tol) | (vbasis != -1)).all(axis=1)
+        mask &= ((rc <= tol) | (vbasis != -2)).all(axis=1)
+        mask &= ((np.abs(rc) <= tol) | (vbasis != -3)).all(axis=1)
+        # duals of inequalities
+        mask &= ((y <= tol) | (senses != "<")).all(axis=1)
+        mask &= ((y >= - tol) | (senses != ">")).all(axis=1)
+        return mask
+
+    def _getSolverState(self):
+        """
+        A method to get state of the Gurobi model, including constraint matrix,
+        bounds, quadratic constraints and changed parameters
+
+        Returns:
+            dict: plain data of the solver model
+        """
+        self._model.update()
+        allvars, constrs = self._model.getVars(), self._model.getConstrs()
+        A = self._model.getA().tocsr()
+        state = {"A": (A.shape, A.indptr, A.indices, A.data),
+                 "rhs": np.array(self._model.getAttr("RHS", constrs)),
+                 "sense": self._model.getAttr("Sense", constrs),
+                 "lb": np.array(self._model.getAttr("LB", allvars)),
+                 "ub": np.array(self._model.getAttr("UB", allvars)),
+                 "vtype": self._model.getAttr("VType", allvars),
+                 "general": (self._model.NumGenConstrs, self._model.NumSOS)}
+        # quadratic constraints
+        qconstrs = self._model.getQConstrs()
+        state["qrhs"] = self._model.getAttr("QCRHS", qconstrs)
+        state["qsense"] = self._model.getAttr("QCSense", qconstrs)
+        state["qrow"] = []
+        for qc in qconstrs:
+            row = self._model.getQCRow(qc)
+            lin = row.getLinExpr()
+            state["qrow"].append(([row.getVar1(i).index for i in range(row.size())],
+                                  [row.getVar2(i).index for i in range(row.size())],
+                                  [row.getCoeff(i) for i in range(row.size())],
+                                  [lin.getVar(i).index for i in range(lin.size())],
+                                  [lin.getCoeff(i) for i in range(lin.size())]))
+        # parameters changed from default
+        state["params"] = {}
+        for name in dir(GRB.Param):
+            if name.startswith("_"):
+                continue
+            _, _, value, _, _, default = self._model.getParamInfo(name)
+            if value != default:
+                state["params"][name] = value
+        return state
+
+    def setWarmStart(self, warmstart=True):
+        """
+        A method to turn on/off warm start, which feeds the basis (LP) or the
+        solution (MIP) of the previous solve into the next one
+
+        Args:
+            warmstart (bool): warm start or not
+        """
+        self._warmstart = warmstart
+        self._resetStart()
+
+    def _resetStart(self):
+        """
+        A method to clear warm start and cached variables and constraints
+        """
+        self._start = None
+        self._vars = None
+        self._constrs = None
+
+    def _optimize(self, callback=None):
+        """
+        A method to optimize model with warm start
+
+        Args:
+            callback (None/function): Gurobi callback, such as lazy constraints
+        """
+        if not self._warmstart:
+            self._model.optimize(callback)
+            return
+        # variables and constraints, cached until model size changes
+        if self._vars is None or len(self._vars) != self._model.NumVars or \
+           len(self._constrs) != self._model.NumConstrs:
+            self._vars, self._constrs = self._model.getVars(), self._model.getConstrs()
+            self._start = None
+        # previous basis or solution
+        if self._start is not None:
+            if self._model.IsMIP:
+                self._model.setAttr("Start", self._vars, self._start[0])
+            else:
+                self._model.setAttr("VBasis", self._vars, self._start[0])
+                self._model.setAttr("CBasis", self._constrs, self._start[1])
+        self._model.optimize(callback)
+        # record for next solve
+        try:
+            if self._model.IsMIP:
+                self._start = (self._model.getAttr("X", self._vars),)
+            else:
+                self._start = (self._model.getAttr("VBasis", self._vars),
+                               self._model.getAttr("CBasis", self._constrs))
+        # no basis, such as QP with barrier, or no solution
+        except (gp.GurobiError, AttributeError):
+            self._start = None
+
     def copy(self):
         """
         A method to copy model
@@ -86,6 +342,9 @@ class optGrbModel(optModel):
             optModel: new copied model
         """
         new_model = copy(self)
+        new_model._objvars = None
+        new_model._resetStart()
+        new_model._auxconstr = None
         # update model
         self._model.update()
         # new model
@@ -115,3 +374,41 @@ class optGrbModel(optModel):
                            for i, k in enumerate(new_model.x)) <= rhs
         new_model._model.addConstr(expr)
         return new_model
+
+    def _getAuxModel(self):
+        """
+        A method to get a copy of model with an empty auxiliary constraint,
+        whose coefficients and right-hand side are updated in place
+
+        Returns:
+            optModel: model for the auxiliary constraint
+        """
+        # customized objective
+        if type(self).setObj is not optGrbModel.setObj:
+            return super()._getAuxModel()
+        new_model = self.copy()
+        new_model._auxconstr = new_model._model.addLConstr(gp.LinExpr(), GRB.LESS_EQUAL, 0)
+        new_model._model.update()
+        return new_model
+
+    def _setAuxConstr(self, coefs, rhs):
+        """
+        A method to set the auxiliary constraint in place, with the same
+        variables as the objective function
+
+        Args:
+            coefs (np.ndarray / list): coeffcients of the constraint
+            rhs (float): right-hand side of the constraint
+
+        Returns:
+            optModel: model with the constraint
+        """
+        if self._auxconstr is None:
+            return super()._setAuxConstr(coefs, rhs)
+        if len(coefs) != self.num_cost:
+            raise ValueError("Size of coef vector cannot cost.")
+        objvars, objmap = self._getObjVars()
+        for var, coef in zip(objvars, np.asarray(coefs, dtype=np.float64)[objmap].tolist()):
+            self._model.chgCoeff(self._auxconstr, var, coef)
+        self._auxconstr.RHS = rhs
+        return self
@@ -135,25 +135,25 @@ class tspGGModel(tspABModel):
                      for (i,j) in x if i != 0)
         return m, x
 
-    def setObj(self, c):
+    def _getObjMap(self):
         """
-        A method to set objective function
+        A method to map variables of objective function to cost vector, with
+        the same cost for both directions of an edge
 
-        Args:
-            c (list): cost vector
+        Returns:
+            tuple: variables (list) and index of cost for each variable (np.ndarray)
         """
-        if len(c) != self.num_cost:
-            raise ValueError("Size of cost vector cannot match vars.")
-        obj = gp.quicksum(c[k] * (self.x[i,j] + self.x[j,i])
-                          for k, (i,j) in enumerate(self.edges))
-        self._model.setObjective(obj)
+        objvars = [self.x[i,j] for (i,j) in self.edges] + \
+                  [self.x[j,i] for (i,j) in self.edges]
+        objmap = np.tile(np.arange(len(self.edges)), 2)
+        return objvars, objmap
 
     def solve(self):
         """
         A method to solve model
         """
         self._model.update()
-        self._model.optimize()
+        self._optimize()
         sol = np.zeros(self.num_cost, dtype=np.uint8)
         for k, (i,j) in enumerate(self.edges):
             if self.x[i,j].x > 1e-2 or self.x[j,i].x > 1e-2:
@@ -237,7 +237,7 @@ class tspGGModelRel(tspGGModel):
             tuple: optimal solution (list) and objective value (float)
         """
         self._model.update()
-        self._model.optimize()
+        self._optimize()
         sol = np.zeros(self.num_cost)
         for k, (i,j) in enumerate(self.edges):
             sol[k] = self.x[i,j].x + self.x[j,i].x
@@ -314,24 +314,23 @@ class tspDFJModel(tspABModel):
                         model.cbLazy(constr)
                     break
 
-    def setObj(self, c):
+    def _getObjMap(self):
         """
-        A method to set objective function
+        A method to map variables of objective function to cost vector, where
+        both directions of an edge share one variable
 
-        Args:
-            c (list): cost vector
+        Returns:
+            tuple: variables (list) and index of cost for each variable (np.ndarray)
         """
-        if len(c) != self.num_cost:
-            raise ValueError("Size of cost vector cannot match vars.")
-        obj = gp.quicksum(c[i] * self.x[k] for i, k in enumerate(self.edges))
-        self._model.setObjective(obj)
+        objvars = [self.x[e] for e in self.edges]
+        return objvars, np.arange(len(self.edges))
 
     def solve(self):
         """
         A method to solve model
         """
         self._model.update()
-        self._model.optimize(self._subtourelim)
+        self._optimize(self._subtourelim)
         sol = np.zeros(self.num_cost, dtype=np.uint8)
         for i, e in enumerate(self.edges):
             if self.x[e].x > 1e-2:
@@ -395,25 +394,25 @@ class tspMTZModel(tspABModel):
                      if (i != 0) and (j != 0))
         return m, x
 
-    def setObj(self, c):
+    def _getObjMap(self):
         """
-        A method to set objective function
+        A method to map variables of objective function to cost vector, with
+        the same cost for both directions of an edge
 
-        Args:
-            c (list): cost vector
+        Returns:
+            tuple: variables (list) and index of cost for each variable (np.ndarray)
         """
-        if len(c) != self.num_cost:
-            raise ValueError("Size of cost vector cannot match vars.")
-        obj = gp.quicksum(c[k] * (self.x[i,j] + self.x[j,i])
-                          for k, (i,j) in enumerate(self.edges))
-        self._model.setObjective(obj)
+        objvars = [self.x[i,j] for (i,j) in self.edges] + \
+                  [self.x[j,i] for (i,j) in self.edges]
+        objmap = np.tile(np.arange(len(self.edges)), 2)
+        return objvars, objmap
 
     def solve(self):
         """
         A method to solve model
         """
         self._model.update()
-        self._model.optimize()
+        self._optimize()
         sol = np.zeros(self.num_cost, dtype=np.uint8)
         for k, (i,j) in enumerate(self.edges):
             if self.x[i,j].x > 1e-2 or self.x[j,i].x > 1e-2:
@@ -494,7 +493,7 @@ class tspMTZModelRel(tspMTZModel):
             tuple: optimal solution (list) and objective value (float)
         """
         self._model.update()
-        self._model.optimize()
+        self._optimize()
         sol = np.zeros(self.num_cost)
         for k, (i,j) in enumerate(self.edges):
             sol[k] = self.x[i,j].x + self.x[j,i].x
@@ -0,0 +1,10 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Solver-free optimization Model based on NumPy
+"""
+
+from pyepo.model.npy.npymodel import optNpyModel
+from pyepo.model.npy.shortestpath import shortestPathModel
+from pyepo.model.npy.knapsack import knapsackModel, knapsackModelRel
+from pyepo.model.npy.portfolio import portfolioModel
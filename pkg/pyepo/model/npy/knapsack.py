@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Knapsack problem
+"""
+
+import numpy as np
+
+from pyepo import EPO
+from pyepo.model.npy.npymodel import optNpyModel
+
+# maximum number of entries in take table of a chunk
+_TABLE_SIZE = 2 ** 26
+
+
+class knapsackModel(optNpyModel):
+    """
+    This class is optimization model for single-dimensional knapsack problem,
+    solved exactly by dynamic programming over capacity
+
+    Weights are scaled by the smallest power of 10 (up to 10^4) which makes
+    them integral, such as weights with two decimals from
+    pyepo.data.knapsack.genData.
+
+    Attributes:
+        weights (np.ndarray): Weights of items
+        capacity (np.ndarray): Total capacity
+        items (int): Number of items
+    """
+
+    def __init__(self, weights, capacity):
+        """
+        Args:
+            weights (np.ndarray / list): weights of items
+            capacity (np.ndarray / list): total capacity
+        """
+        self.weights = np.array(weights, dtype=np.float64)
+        self.capacity = np.array(capacity, dtype=np.float64)
+        if self.weights.ndim != 2 or len(self.weights) != 1 or self.capacity.size != 1:
+            raise ValueError("Only single-dimensional knapsack is supported.")
+        if (self.weights <= 0).any() or self.capacity.item() < 0:
+            raise ValueError("Weights should be positive and capacity should be nonnegative.")
+        self.items = self.weights.shape[1]
+        super().__init__()
+
+    def _getModel(self):
+        """
+        A method to get integral weights and capacity
+
+        Returns:
+            tuple: no solver model and variables
+        """
+        # sense
+        self.modelSense = EPO.MAXIMIZE
+        # scale weights into integers
+        for scale in 10 ** np.arange(5):
+            weights = self.weights[0] * scale
+            if np.allclose(weights, np.round(weights), rtol=0, atol=1e-6):
+                break
+        else:
+            raise ValueError("Weights should have at most 4 decimals.")
+        weights = np.round(weights).astype(int)
+        # reduce by greatest common divisor
+        gcd = np.gcd.reduce(weights) if self.items else 1
+        self._weights = weights // gcd
+        self._capacity = int(np.floor(self.capacity.item() * scale + 1e-6)) // gcd
+        return None, list(range(self.items))
+
+    def solveBatch(self, costs):
+        """
+        A method to solve model for a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        costs = self._checkCosts(costs)
+        # chunks of rows to bound memory of take table
+        size = max(1, _TABLE_SIZE // (max(self.items, 1) * (self._capacity + 1)))
+        sols = np.zeros(costs.shape)
+        objs = np.zeros(len(costs))
+        for i in range(0, len(costs), size):
+            sols[i:i+size], objs[i:i+size] = self._solveChunk(costs[i:i+size])
+        return sols, objs
+
+    def _solveChunk(self, costs):
+        """
+        A method to solve a chunk of cost vectors by dynamic programming
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        b = len(costs)
+        cap = self._capacity
+        # best value with each remaining capacity
+        value = np.zeros((b, cap + 1))
+        # whether item is taken
+        take = np.zeros((self.items, b, cap + 1), dtype=bool)
+        for k, w in enumerate(self._weights):
+            if w > cap:
+                continue
+            cand = value[:,:cap+1-w] + costs[:,k:k+1]
+            take[k,:,w:] = cand > value[:,w:]
+            value[:,w:] = np.maximum(value[:,w:], cand)
+        # backtrack from full capacity
+        sols = np.zeros((b, self.items))
+        ins = np.arange(b)
+        rest = np.full(b, cap)
+        for k in reversed(range(self.items)):
+            sols[:,k] = take[k,ins,rest]
+            rest = rest - sols[:,k].astype(int) * self._weights[k]
+        objs = value[:,cap]
+        return sols, objs
+
+    def relax(self):
+        """
+        A method to get linear relaxation model
+        """
+        # copy
+        model_rel = knapsackModelRel(self.weights, self.capacity)
+        return model_rel
+
+
+class knapsackModelRel(knapsackModel):
+    """
+    This class is relaxed optimization model for single-dimensional knapsack
+    problem, solved in closed form by sorting items by value-to-weight ratio
+    """
+
+    def _getModel(self):
+        """
+        A method to get sense and variables
+
+        Returns:
+            tuple: no solver model and variables
+        """
+        # sense
+        self.modelSense = EPO.MAXIMIZE
+        return None, list(range(self.items))
+
+    def solveBatch(self, costs):
+        """
+        A method to solve model for a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        costs = self._checkCosts(costs)
+        weights = self.weights[0]
+        # items by value-to-weight ratio
+        order = np.argsort(- costs / weights, axis=1, kind="stable")
+        w = weights[order]
+        c = np.take_along_axis(costs, order, axis=1)
+        # remaining capacity before each item
+        rest = self.capacity.item() - (np.cumsum(w, axis=1) - w)
+        # greedy with fractional last item, only profitable items
+        x = np.clip(rest / w, 0, 1) * (c > 0)
+        sols = np.zeros_like(costs)
+        np.put_along_axis(sols, order, x, axis=1)
+        objs = (sols * costs).sum(axis=1)
+        return sols, objs
+
+    def relax(self):
+        """
+        A forbidden method to relax MIP model
+        """
+        raise RuntimeError("Model has already been relaxed.")
+
+
+if __name__ == "__main__":
+
+    # random seed
+    np.random.seed(42)
+    # set random cost for test
+    cost = np.random.random(16)
+    weights = np.random.choice(range(300, 800), size=(1,16)) / 100
+    capacity = [20]
+
+    # solve model
+    optmodel = knapsackModel(weights=weights, capacity=capacity) # init model
+    optmodel = optmodel.copy()
+    optmodel.setObj(cost) # set objective function
+    sol, obj = optmodel.solve() # solve
+    # print res
+    print('Obj: {}'.format(obj))
+    for i in range(16):
+        if sol[i] > 1e-3:
+            print(i)
+
+    # relax
+    optmodel = optmodel.relax()
+    optmodel.setObj(cost) # set objective function
+    sol, obj = optmodel.solve() # solve
+    # print res
+    print('Obj: {}'.format(obj))
+    for i in range(16):
+        if sol[i] > 1e-3:
+            print(i)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Abstract solver-free optimization model based on NumPy
+"""
+
+from abc import abstractmethod
+
+import numpy as np
+
+from pyepo.model.opt import optModel
+
+
+class optNpyModel(optModel):
+    """
+    This is an abstract class for solver-free optimization model, which solves a
+    batch of cost vectors at once with vectorized NumPy algorithms
+
+    Attributes:
+        _model (None): no solver model in the background
+        x (list): index of decision variables
+    """
+
+    def __init__(self):
+        super().__init__()
+        # cost vector
+        self._cost = None
+
+    def __repr__(self):
+        return "optNpyModel " + self.__class__.__name__
+
+    def setObj(self, c):
+        """
+        A method to set objective function
+
+        Args:
+            c (np.ndarray / list): cost of objective function
+        """
+        if len(c) != self.num_cost:
+            raise ValueError("Size of cost vector cannot match vars.")
+        self._cost = np.array(c, dtype=np.float64)
+
+    def solve(self):
+        """
+        A method to solve model
+
+        Returns:
+            tuple: optimal solution (np.ndarray) and objective value (float)
+        """
+        if self._cost is None:
+            raise RuntimeError("Objective function has not been set.")
+        sols, objs = self.solveBatch(self._cost.reshape(1, -1))
+        return sols[0], objs[0]
+
+    @abstractmethod
+    def solveBatch(self, costs):
+        """
+        An abstract method to solve model for a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        raise NotImplementedError
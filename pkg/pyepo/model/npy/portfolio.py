@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Portfolio problem
+"""
+
+import numpy as np
+
+from pyepo import EPO
+from pyepo.model.npy.npymodel import optNpyModel
+
+
+class portfolioModel(optNpyModel):
+    """
+    This class is optimization model for portfolio problem, solved by bisection
+    on the multiplier of the risk constraint with accelerated projected gradient
+    over the simplex, vectorized across the batch
+
+    Attributes:
+        num_assets (int): number of assets
+        covariance (numpy.ndarray): covariance matrix of the returns
+        gamma (float): risk level parameter
+        cov (numpy.ndarray): covariance matrix of the returns
+        risk_level (float): risk level
+        tol (float): tolerance of solutions
+        max_iter (int): maximum number of iterations
+    """
+
+    def __init__(self, num_assets, covariance, gamma=2.25, tol=1e-6, max_iter=1000):
+        """
+        Args:
+            num_assets (int): number of assets
+            covariance (numpy.ndarray): covariance matrix of the returns
+            gamma (float): risk level parameter
+            tol (float): tolerance of solutions
+            max_iter (int): maximum number of iterations
+        """
+        self.num_assets = num_assets
+        # args to rebuild model
+        self.covariance = covariance
+        self.gamma = gamma
+        self.cov = np.array(covariance, dtype=np.float64)
+        self.risk_level = self._getRiskLevel(gamma)
+        self.tol = tol
+        self.max_iter = max_iter
+        super().__init__()
+
+    def _getRiskLevel(self, gamma):
+        """
+        A method to calculate risk level
+
+        Returns:
+            float: risk level
+        """
+        risk_level = gamma * np.mean(self.cov)
+        return risk_level
+
+    def _getModel(self):
+        """
+        A method to factorize covariance matrix once
+
+        Returns:
+            tuple: no solver model and variables
+        """
+        # sense
+        self.modelSense = EPO.MAXIMIZE
+        # Cholesky factor for risk, requires positive definite covariance
+        try:
+            self._chol = np.linalg.cholesky(self.cov)
+        except np.linalg.LinAlgError:
+            raise ValueError("Covariance matrix should be positive definite.")
+        # strong convexity and smoothness of risk
+        eigs = np.linalg.eigvalsh(self.cov)
+        self._step = 1 / (2 * eigs[-1])
+        self._momentum = (np.sqrt(eigs[-1]) - np.sqrt(eigs[0])) / \
+                         (np.sqrt(eigs[-1]) + np.sqrt(eigs[0]))
+        # minimum risk portfolio should satisfy risk level
+        x = self._solveInner(np.zeros((1, self.num_assets)), np.zeros(1),
+                             np.full((1, self.num_assets), 1 / self.num_assets))
+        if self._getRisk(x)[0] > self.risk_level * (1 + 1e-6):
+            raise ValueError("Risk level {:.4e} is below minimum risk {:.4e}.".
+                format(self.risk_level, self._getRisk(x)[0]))
+        return None, list(range(self.num_assets))
+
+    def solveBatch(self, costs):
+        """
+        A method to solve model for a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        costs = self._checkCosts(costs)
+        sols = np.zeros_like(costs)
+        # best single asset if risk is not binding
+        best = np.argmax(costs, axis=1)
+        free = np.diag(self.cov)[best] <= self.risk_level
+        sols[free, best[free]] = 1
+        # risk is binding
+        if not free.all():
+            sols[~free] = self._solveBinding(costs[~free])
+        objs = (sols * costs).sum(axis=1)
+        return sols, objs
+
+    def _solveBinding(self, r):
+        """
+        A method to solve problems with binding risk constraint, where the
+        solution minimizes risk - t * return for the t with risk at the level
+
+        Args:
+            r (np.ndarray): returns
+
+        Returns:
+            np.ndarray: optimal solutions
+        """
+        # minimum risk portfolio
+        lo = np.zeros(len(r))
+        x = self._solveInner(r, lo, np.full(r.shape, 1 / self.num_assets))
+        # upper bound of trade-off with risk over the level
+        hi = 2 * np.diag(self.cov).max() / (np.ptp(r, axis=1) + 1e-12)
+        x_hi = x
+        for _ in range(64):
+            x_hi = self._solveInner(r, hi, x_hi)
+            over = self._getRisk(x_hi) > self.risk_level
+            if over.all():
+                break
+            hi[~over] *= 2
+        # bisection on trade-off
+        for _ in range(self.max_iter):
+            mid = (lo + hi) / 2
+            x = self._solveInner(r, mid, x)
+            over = self._getRisk(x) > self.risk_level
+            hi[over] = mid[over]
+            lo[~over] = mid[~over]
+            if (hi - lo <= self.tol * hi).all():
+                break
+        # feasible side
+        return self._solveInner(r, lo, x)
+
+    def _solveInner(self, r, t, x):
+        """
+        A method to minimize risk - t * return over simplex with accelerated
+        projected gradient
+
+        Args:
+            r (np.ndarray): returns
+            t (np.ndarray): trade-off of returns
+            x (np.ndarray): initial solutions
+
+        Returns:
+            np.ndarray: solutions
+        """
+        y = x
+        for _ in range(self.max_iter):
+            grad = 2 * y @ self.cov - t[:,None] * r
+            x_new = _projSimplex(y - self._step * grad)
+            if np.abs(x_new - y).max() <= self.tol:
+                return x_new
+            y = x_new + self._momentum * (x_new - x)
+            x = x_new
+        return x
+
+    def _getRisk(self, x):
+        """
+        A method to calculate risk with Cholesky factor
+
+        Args:
+            x (np.ndarray): solutions
+
+        Returns:
+            np.ndarray: risk of each solution
+        """
+        return np.square(x @ self._chol).sum(axis=1)
+
+
+def _projSimplex(v):
+    """
+    A function to project rows onto probability simplex
+
+    Args:
+        v (np.ndarray): vectors
+
+    Returns:
+        np.ndarray: projected vectors
+    """
+    u = -np.sort(-v, axis=1)
+    css = np.cumsum(u, axis=1) - 1
+    ind = np.arange(1, v.shape[1] + 1)
+    # number of positive entries
+    rho = (u - css / ind > 0).sum(axis=1)
+    theta = css[np.arange(len(v)), rho - 1] / rho
+    return np.maximum(v - theta[:,None], 0)
+
+
+if __name__ == "__main__":
+
+    from pyepo.data.portfolio import genData
+    # set random cost for test
+    cov, _, revenue = genData(num_data=100, num_features=4, num_assets=50, deg=2)
+
+    # solve model
+    optmodel = portfolioModel(num_assets=50, covariance=cov) # init model
+    optmodel = optmodel.copy()
+    optmodel.setObj(revenue[0]) # set objective function
+    sol, obj = optmodel.solve() # solve
+    # print res
+    print('Obj: {}'.format(obj))
+    for i in range(50):
+        if sol[i] > 1e-3:
+            print(i, sol[i])
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Shortest path problem
+"""
+
+import numpy as np
+
+from pyepo import EPO
+from pyepo.model.npy.npymodel import optNpyModel
+
+
+class shortestPathModel(optNpyModel):
+    """
+    This class is optimization model for shortest path problem on a grid
+    network, solved by dynamic programming over the grid diagonals
+
+    Attributes:
+        grid (tuple of int): Size of grid network
+        arcs (list): List of arcs
+    """
+
+    def __init__(self, grid):
+        """
+        Args:
+            grid (tuple of int): size of grid network
+        """
+        self.grid = grid
+        self.arcs = self._getArcs()
+        super().__init__()
+
+    def _getArcs(self):
+        """
+        A method to get list of arcs for grid network
+
+        Returns:
+            list: arcs
+        """
+        arcs = []
+        for i in range(self.grid[0]):
+            # edges on rows
+            for j in range(self.grid[1] - 1):
+                v = i * self.grid[1] + j
+                arcs.append((v, v + 1))
+            # edges in columns
+            if i == self.grid[0] - 1:
+                continue
+            for j in range(self.grid[1]):
+                v = i * self.grid[1] + j
+                arcs.append((v, v + self.grid[1]))
+        return arcs
+
+    def _getModel(self):
+        """
+        A method to build index of arcs on the grid
+
+        Returns:
+            tuple: no solver model and variables
+        """
+        # sense
+        self.modelSense = EPO.MINIMIZE
+        # arc index of the node to its right and to its bottom
+        self._right = np.zeros(self.grid, dtype=int)
+        self._down = np.zeros(self.grid, dtype=int)
+        for k, (u, v) in enumerate(self.arcs):
+            i, j = divmod(u, self.grid[1])
+            # same row
+            if v // self.grid[1] == i:
+                self._right[i, j] = k
+            else:
+                self._down[i, j] = k
+        return None, list(range(len(self.arcs)))
+
+    def solveBatch(self, costs):
+        """
+        A method to solve model for a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        costs = self._checkCosts(costs)
+        m, n = self.grid
+        b = len(costs)
+        # shortest distance from source and whether it comes from above
+        dist = np.full((b, m, n), np.inf)
+        dist[:,0,0] = 0
+        from_up = np.zeros((b, m, n), dtype=bool)
+        # forward pass over diagonals
+        for k in range(1, m + n - 1):
+            i = np.arange(max(0, k - n + 1), min(k, m - 1) + 1)
+            j = k - i
+            # from left node
+            dist_left = np.full((b, len(i)), np.inf)
+            mask = j > 0
+            il, jl = i[mask], j[mask] - 1
+            dist_left[:,mask] = dist[:,il,jl] + costs[:,self._right[il,jl]]
+            # from upper node
+            dist_up = np.full((b, len(i)), np.inf)
+            mask = i > 0
+            iu, ju = i[mask] - 1, j[mask]
+            dist_up[:,mask] = dist[:,iu,ju] + costs[:,self._down[iu,ju]]
+            # best predecessor
+            from_up[:,i,j] = dist_up < dist_left
+            dist[:,i,j] = np.minimum(dist_left, dist_up)
+        # backtrack from sink
+        sols = np.zeros((b, self.num_cost))
+        ins = np.arange(b)
+        i = np.full(b, m - 1)
+        j = np.full(b, n - 1)
+        for _ in range(m + n - 2):
+            up = from_up[ins,i,j]
+            arc = np.where(up, self._down[i-1,j], self._right[i,j-1])
+            sols[ins,arc] = 1
+            i = i - up
+            j = j - ~up
+        objs = dist[:,m-1,n-1]
+        return sols, objs
+
+
+if __name__ == "__main__":
+
+    import random
+    # random seed
+    random.seed(42)
+    # set random cost for test
+    cost = [random.random() for _ in range(40)]
+
+    # solve model
+    optmodel = shortestPathModel(grid=(5,5)) # init model
+    optmodel = optmodel.copy()
+    optmodel.setObj(cost) # set objective function
+    sol, obj = optmodel.solve() # solve
+    # print res
+    print('Obj: {}'.format(obj))
+    for i, e in enumerate(optmodel.arcs):
+        if sol[i] > 1e-3:
+            print(e)
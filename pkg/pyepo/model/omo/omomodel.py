@@ -5,6 +5,8 @@ Abstract optimization model based on Pyomo
 """
 
 from copy import copy
+
+import numpy as np
 from pyomo import opt as po
 from pyomo import environ as pe
 
@@ -72,6 +74,42 @@ class optOmoModel(optModel):
         self._solverfac.solve(self._model)
         return [pe.value(self.x[k]) for k in self.x], pe.value(self._model.obj)
 
+    def solveBatch(self, costs):
+        """
+        A method to solve model for a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        # customized objective or solution
+        if (type(self).setObj is not optOmoModel.setObj) or \
+           (type(self).solve is not optOmoModel.solve):
+            return super().solveBatch(costs)
+        costs = self._checkCosts(costs)
+        # objective with mutable coefficients, built once per batch
+        if self._model.component("cost_coef") is None:
+            self._model.cost_coef = pe.Param(range(self.num_cost),
+                                             mutable=True, initialize=0)
+        coef = self._model.cost_coef
+        self._model.del_component(self._model.obj)
+        obj = sum(coef[i] * self.x[k] for i, k in enumerate(self.x))
+        if self.modelSense == EPO.MINIMIZE:
+            self._model.obj = pe.Objective(sense=pe.minimize, expr=obj)
+        if self.modelSense == EPO.MAXIMIZE:
+            self._model.obj = pe.Objective(sense=pe.maximize, expr=obj)
+        # preallocate outputs
+        sols = np.empty((len(costs), self.num_cost))
+        objs = np.empty(len(costs))
+        for i, c in enumerate(costs):
+            coef.store_values(dict(enumerate(c.tolist())))
+            self._solverfac.solve(self._model)
+            sols[i] = [pe.value(self.x[k]) for k in self.x]
+            objs[i] = pe.value(self._model.obj)
+        return sols, objs
+
     def copy(self):
         """
         A method to copy model
@@ -86,6 +124,21 @@ class optOmoModel(optModel):
         new_model.x = new_model._model.x
         return new_model
 
+    def _getSolverState(self):
+        """
+        A method to get state of the Pyomo model, including constraints, bounds
+        and solver options
+
+        Returns:
+            dict: plain data of the solver model
+        """
+        constrs = [(str(constr.body), pe.value(constr.lower), pe.value(constr.upper))
+                   for constr in self._model.component_data_objects(pe.Constraint, active=True)]
+        variables = [(var.name, var.lb, var.ub, str(var.domain))
+                     for var in self._model.component_data_objects(pe.Var)]
+        return {"constrs": constrs, "vars": variables,
+                "options": dict(self._solverfac.options)}
+
     def addConstr(self, coefs, rhs):
         """
         A method to add new constraint
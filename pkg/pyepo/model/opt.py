@@ -7,6 +7,8 @@ Abstract optimization model
 from abc import ABC, abstractmethod
 from copy import deepcopy
 
+import numpy as np
+
 from pyepo import EPO
 
 class optModel(ABC):
@@ -63,6 +65,47 @@ class optModel(ABC):
         """
         raise NotImplementedError
 
+    def solveBatch(self, costs):
+        """
+        A method to solve model for a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        costs = self._checkCosts(costs)
+        # preallocate outputs
+        sols = np.empty((len(costs), self.num_cost))
+        objs = np.empty(len(costs))
+        for i, c in enumerate(costs):
+            # solve
+            self.setObj(c)
+            res = self.solve()
+            try:
+                sols[i], objs[i] = res
+            except (TypeError, ValueError) as e:
+                raise ValueError(
+                    "For optModel, the method 'solve' should return solution vector and objective value."
+                ) from e
+        return sols, objs
+
+    def _checkCosts(self, costs):
+        """
+        A method to check the shape of a batch of cost vectors
+
+        Args:
+            costs (np.ndarray): costs of objective function
+
+        Returns:
+            np.ndarray: costs with shape (batch, num_cost)
+        """
+        costs = np.asarray(costs)
+        if costs.ndim != 2 or costs.shape[1] != self.num_cost:
+            raise ValueError("Size of cost matrix cannot match vars.")
+        return costs
+
     def copy(self):
         """
         An abstract method to copy model
@@ -86,6 +129,69 @@ class optModel(ABC):
         """
         raise NotImplementedError
 
+    def _getAuxModel(self):
+        """
+        A method to get a model for an auxiliary constraint, which is set by
+        _setAuxConstr, the model itself by default
+
+        Returns:
+            optModel: model for the auxiliary constraint
+        """
+        return self
+
+    def _setAuxConstr(self, coefs, rhs):
+        """
+        A method to set the auxiliary constraint, as a new model with the added
+        constraint by default
+
+        Args:
+            coefs (ndarray): coeffcients of the constraint
+            rhs (float): right-hand side of the constraint
+
+        Returns:
+            optModel: model with the constraint
+        """
+        return self.addConstr(coefs, rhs)
+
+    def _solveBatchCert(self, costs):
+        """
+        A method to solve model for a batch of cost vectors with certificates,
+        which show other cost vectors for which solutions remain optimal, none
+        by default
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray), objective values (np.ndarray) and certificates (None / list)
+        """
+        sols, objs = self.solveBatch(costs)
+        return sols, objs, None
+
+    def _checkCert(self, cert, costs):
+        """
+        A method to check whether a certified solution remains optimal for cost
+        vectors, never by default
+
+        Args:
+            cert (object): certificate of a solution
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            np.ndarray: mask of cost vectors for which solution remains optimal
+        """
+        return np.zeros(len(costs), dtype=bool)
+
+    def _getSolverState(self):
+        """
+        A method to get state of the solver model which is not in attributes,
+        such as added constraints and parameters, none by default
+
+        Returns:
+            object: plain data of the solver model (None for no solver model)
+        """
+        return None
+
     def relax(self):
         """
         A unimplemented method to relax MIP model
@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+Persistent worker pool to solve optimization models in parallel
+"""
+
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import weakref
+
+import numpy as np
+from pathos.pools import _ProcessPool
+
+from pyepo.utlis import getArgs
+
+
+# optimization model kept alive in each worker process
+_optmodel = None
+# error of building model in each worker process
+_initerror = None
+# shared memory blocks attached in each worker process
+_blocks = {}
+
+
+def _initWorker(model_type, args):
+    """
+    A function to build optimization model once when the worker process starts
+
+    Args:
+        model_type (ABCMeta): optModel class type
+        args (dict): optModel args
+    """
+    global _optmodel, _initerror
+    # report on the first task instead of restarting worker
+    try:
+        _optmodel = model_type(**args)
+    except Exception as e:
+        _initerror = e
+
+
+def _getModel():
+    """
+    A function to get the cached model in worker
+
+    Returns:
+        optModel: optimization model
+    """
+    if _initerror is not None:
+        raise _initerror
+    return _optmodel
+
+
+def _solveChunk(costs):
+    """
+    A function to solve a chunk of cost vectors with the cached model in worker
+
+    Args:
+        costs (np.ndarray): costs of objective function
+
+    Returns:
+        tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+    """
+    return _getModel().solveBatch(costs)
+
+
+def _attachBlocks(names):
+    """
+    A function to attach shared memory blocks in worker, cached until the main
+    process reallocates them
+
+    Args:
+        names (tuple): names of shared memory blocks
+
+    Returns:
+        tuple: shared memory blocks
+    """
+    global _blocks
+    if names not in _blocks:
+        for blocks in _blocks.values():
+            for block in blocks:
+                block.close()
+        # tracker inherited from the main process with fork
+        inherited = resource_tracker._resource_tracker._fd is not None
+        blocks = tuple(SharedMemory(name=name) for name in names)
+        # owned and unlinked by the main process
+        if not inherited:
+            for block in blocks:
+                resource_tracker.unregister(block._name, "shared_memory")
+        _blocks = {names: blocks}
+    return _blocks[names]
+
+
+def _solveSharedChunk(task):
+    """
+    A function to solve a slice of cost vectors in shared memory and write
+    solutions and objective values back in place
+
+    Args:
+        task (tuple): names of cost/solution/objective blocks, batch shape and slice
+    """
+    names, shape, start, end = task
+    optmodel = _getModel()
+    cost_block, sol_block, obj_block = _attachBlocks(names)
+    # views on shared memory
+    costs = np.ndarray(shape, dtype=np.float64, buffer=cost_block.buf)
+    sols = np.ndarray(shape, dtype=np.float64, buffer=sol_block.buf)
+    objs = np.ndarray(shape[0], dtype=np.float64, buffer=obj_block.buf)
+    # solve in place
+    sols[start:end], objs[start:end] = optmodel.solveBatch(costs[start:end])
+    del costs, sols, objs
+
+
+class optPool:
+    """
+    This class is a pool of worker processes for optimization. Each worker
+    rebuilds the optModel once at startup and keeps it for all subsequent
+    solves, so only contiguous slices of cost vectors are dispatched.
+
+    With shared memory, a batch of costs is written once into a shared block,
+    and workers write solutions and objective values into preallocated shared
+    outputs, so that only slice indices are serialized.
+
+    Attributes:
+        model_type (ABCMeta): optModel class type
+        args (dict): optModel args
+        processes (int): number of processors
+        chunksize (int): number of cost vectors per dispatched task
+        shared (bool): transport costs and solutions through shared memory
+    """
+
+    def __init__(self, optmodel, processes, chunksize=None, shared=True):
+        """
+        Args:
+            optmodel (optModel): an PyEPO optimization model
+            processes (int): number of processors
+            chunksize (None/int): number of cost vectors per task, None for one chunk per processor
+            shared (bool): transport costs and solutions through shared memory or pickling
+        """
+        self.model_type = type(optmodel)
+        self.args = getArgs(optmodel)
+        self.processes = processes
+        self.chunksize = chunksize
+        self.shared = shared
+        # rebuild once to raise errors of args before workers start
+        self.model_type(**self.args)
+        # shared memory blocks for costs, solutions and objective values
+        self._blocks = None
+        if self.shared:
+            resource_tracker.ensure_running()
+        self._pool = _ProcessPool(processes, initializer=_initWorker,
+                                  initargs=(self.model_type, self.args))
+        # resources to free when pool is collected or interpreter exits
+        self._resources = {"pool": self._pool, "blocks": None}
+        self._finalizer = weakref.finalize(self, _shutdown, self._resources)
+
+    def __repr__(self):
+        return "optPool {} x {}".format(self.processes, self.model_type.__name__)
+
+    def solveBatch(self, costs):
+        """
+        A method to solve a batch of cost vectors in parallel
+
+        Args:
+            costs (np.ndarray): costs of objective function with shape (batch, num_cost)
+
+        Returns:
+            tuple: optimal solutions (np.ndarray) and objective values (np.ndarray)
+        """
+        costs = np.asarray(costs, dtype=np.float64)
+        # contiguous chunks
+        bounds = self._getBounds(len(costs))
+        # pickle chunks
+        if not self.shared:
+            chunks = [costs[start:end] for start, end in bounds]
+            res = self._pool.map(_solveChunk, chunks)
+            sols = np.concatenate([r[0] for r in res])
+            objs = np.concatenate([r[1] for r in res])
+            return sols, objs
+        # write costs into shared memory
+        self._reserve(costs.size)
+        cost_block, sol_block, obj_block = self._blocks
+        np.ndarray(costs.shape, dtype=np.float64, buffer=cost_block.buf)[:] = costs
+        # solve in place
+        names = tuple(block.name for block in self._blocks)
+        tasks = [(names, costs.shape, start, end) for start, end in bounds]
+        self._pool.map(_solveSharedChunk, tasks)
+        # copy out of shared memory
+        sols = np.ndarray(costs.shape, dtype=np.float64, buffer=sol_block.buf).copy()
+        objs = np.ndarray(len(costs), dtype=np.float64, buffer=obj_block.buf).copy()
+        return sols, objs
+
+    def _getBounds(self, num):
+        """
+        A method to split a batch into contiguous slices
+
+        Args:
+            num (int): batch size
+
+        Returns:
+            list: start and end index of slices
+        """
+        if self.chunksize is None:
+            num_chunks = min(self.processes, num)
+        else:
+            num_chunks = int(np.ceil(num / self.chunksize))
+        splits = np.linspace(0, num, max(num_chunks, 1) + 1).astype(int)
+        return [(int(start), int(end)) for start, end in zip(splits[:-1], splits[1:])
+                if end > start]
+
+    def _reserve(self, size):
+        """
+        A method to allocate shared memory blocks with enough capacity
+
+        Args:
+            size (int): number of cost entries
+        """
+        if self._blocks is not None and self._blocks[0].size >= size * 8:
+            return
+        # grow geometrically to avoid frequent reallocation
+        capacity = 8 * max(size, 1)
+        if self._blocks is not None:
+            capacity = max(capacity, 2 * self._blocks[0].size)
+        self._release()
+        self._blocks = (SharedMemory(create=True, size=capacity),
+                        SharedMemory(create=True, size=capacity),
+                        SharedMemory(create=True, size=capacity))
+        self._resources["blocks"] = self._blocks
+
+    def _release(self):
+        """
+        A method to free shared memory blocks
+        """
+        if self._blocks is None:
+            return
+        _releaseBlocks(self._blocks)
+        self._blocks = None
+        self._resources["blocks"] = None
+
+    def close(self):
+        """
+        A method to shut down worker processes and free shared memory
+        """
+        self._finalizer()
+        self._pool = None
+        self._blocks = None
+
+
+def _releaseBlocks(blocks):
+    """
+    A function to free shared memory blocks
+
+    Args:
+        blocks (tuple): shared memory blocks
+    """
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def _shutdown(resources):
+    """
+    A function to shut down worker processes and free shared memory, called
+    once by close, garbage collection or interpreter exit
+
+    Args:
+        resources (dict): worker pool and shared memory blocks
+    """
+    resources["pool"].terminate()
+    resources["pool"].join()
+    if resources["blocks"] is not None:
+        _releaseBlocks(resources["blocks"])
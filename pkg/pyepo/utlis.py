@@ -5,8 +5,11 @@
 Utility function
 """
 
+import hashlib
 import inspect
 
+import numpy as np
+
 def getArgs(model):
     """
     A global function to get args of model
@@ -25,3 +28,95 @@ def getArgs(model):
                 if name in inspect.signature(model.__init__).parameters:
                     args[name] = attrs[name]
             return args
+
+
+def getState(model):
+    """
+    A global function to get args, plain attributes and solver state of
+    model, such as arrays which are not recovered by getArgs and constraints
+    added to the solver model
+
+    Args:
+        model (optModel): optimization model
+
+    Return:
+        dict: model state
+    """
+    state = {name: value for name, value in vars(model).items()
+             if not name.startswith("_") and _isPlain(value)}
+    state.update(getArgs(model))
+    state["_solver"] = model._getSolverState()
+    return state
+
+
+def getSignature(model_type, args):
+    """
+    A global function to get digest of model class and args
+
+    Args:
+        model_type (ABCMeta): optModel class type
+        args (dict): optModel args
+
+    Return:
+        str: hex digest
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update("{}.{}".format(model_type.__module__, model_type.__qualname__).encode())
+    _updateHash(h, args)
+    return h.hexdigest()
+
+
+def getRowKeys(costs):
+    """
+    A global function to get digests of cost vectors
+
+    Args:
+        costs (np.ndarray): costs of objective function
+
+    Return:
+        list: digest bytes of each row
+    """
+    costs = np.ascontiguousarray(costs, dtype=np.float64)
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in costs]
+
+
+def _updateHash(h, obj):
+    """
+    A function to feed an object into hash deterministically
+
+    Args:
+        h (hashlib._Hash): hash object
+        obj (object): model args
+    """
+    if isinstance(obj, dict):
+        h.update(b"d")
+        for key in sorted(obj, key=str):
+            _updateHash(h, key)
+            _updateHash(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"l")
+        for item in obj:
+            _updateHash(h, item)
+    elif isinstance(obj, np.ndarray):
+        h.update("a{}{}".format(obj.dtype.str, obj.shape).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    else:
+        h.update(repr(obj).encode())
+
+
+def _isPlain(obj):
+    """
+    A function to check whether an attribute is plain data, which can be hashed
+    deterministically, rather than solver objects
+
+    Args:
+        obj (object): attribute of model
+
+    Return:
+        bool: plain data or not
+    """
+    if isinstance(obj, dict):
+        return all(_isPlain(key) and _isPlain(value) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return all(_isPlain(item) for item in obj)
+    return obj is None or isinstance(obj, (bool, int, float, str, np.generic, np.ndarray))